@@ -3,8 +3,9 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+import orjson
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -13,6 +14,7 @@ from app.core.auth_state_store import (
     copy_auth_state_to_dir,
     delete_auth_state,
     list_auth_states,
+    new_upload_tempfile,
     save_auth_state,
     storage_state_b64,
     get_auth_state_paths,
@@ -23,6 +25,9 @@ from app.db.session import get_db
 
 router = APIRouter(prefix="/auth-states", tags=["auth-states"])
 
+# 업로드는 메모리에 통째로 올리지 않고 이 크기 단위로 디스크에 기록
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class AuthStateOut(BaseModel):
     id: str
@@ -45,19 +50,35 @@ def list_my_auth_states(user: User = Depends(get_current_user)):
 
 
 @router.post("", response_model=AuthStateOut)
-async def upload_auth_state(
+def upload_auth_state(
     name: str = Form(""),
     provider: str = Form("google"),
     storage_state: UploadFile = File(...),
     user: User = Depends(get_current_user),
 ):
-    content = await storage_state.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="empty storage_state file")
+    # sync 핸들러: FastAPI 스레드풀에서 실행되므로 청크 쓰기/JSON 검증/rename이 이벤트 루프를 막지 않음
+    tmp = new_upload_tempfile(user.id)
     try:
-        meta = save_auth_state(owner_user_id=user.id, name=name, provider=provider, raw_json_bytes=content)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        with tmp:
+            src = storage_state.file
+            first = src.read(_UPLOAD_CHUNK_SIZE)
+            if not first.strip():
+                raise HTTPException(status_code=400, detail="empty storage_state file")
+            # storageState는 JSON object: 첫 청크에서 바로 판별되는 형식 오류는 나머지를 디스크에 쓰기 전에 거절
+            if not first.lstrip().startswith(b"{"):
+                raise HTTPException(status_code=400, detail="storageState must be an object")
+            chunk = first
+            while chunk:
+                tmp.write(chunk)
+                chunk = src.read(_UPLOAD_CHUNK_SIZE)
+        try:
+            meta = save_auth_state(owner_user_id=user.id, name=name, provider=provider, src_path=tmp.name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        # 성공 시 save_auth_state가 rename으로 가져가므로 실패한 경우에만 남아 있음
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
     return AuthStateOut(**meta.__dict__)
 
 
@@ -77,7 +98,9 @@ def get_auth_state_b64(auth_state_id: str, user: User = Depends(get_current_user
         b64 = storage_state_b64(user.id, auth_state_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="auth state not found")
-    return AuthStateB64Out(auth_state_id=auth_state_id, b64=b64)
+    # base64 값은 JSON 이스케이프가 필요 없는 ASCII이므로, 큰 문자열을 다시 인코딩하지 않고 본문에 그대로 붙입니다.
+    body = b'{"auth_state_id":' + orjson.dumps(auth_state_id) + b',"b64":"' + b64 + b'"}'
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/{auth_state_id}")
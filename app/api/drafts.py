@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import json
-
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.api.auth import get_current_user
 from app.db.models import CombinationDraft, User
@@ -39,6 +38,7 @@ def list_drafts(db: Session = Depends(get_db), user: User = Depends(get_current_
     """
     rows = (
         db.query(CombinationDraft)
+        .options(raiseload("*"))
         .filter(CombinationDraft.owner_user_id == user.id)
         .order_by(CombinationDraft.updated_at.desc())
         .limit(200)
@@ -51,7 +51,7 @@ def list_drafts(db: Session = Depends(get_db), user: User = Depends(get_current_
                 id=r.id,
                 name=r.name,
                 team_id=r.team_id,
-                combinations=json.loads(r.combinations_json),
+                combinations=orjson.loads(r.combinations_json),
                 created_at=r.created_at.isoformat(),
                 updated_at=r.updated_at.isoformat(),
             )
@@ -78,7 +78,7 @@ def create_draft(body: DraftCreateIn, db: Session = Depends(get_db), user: User
         owner_user_id=user.id,
         name=body.name.strip(),
         team_id=body.team_id,
-        combinations_json=json.dumps(body.combinations, ensure_ascii=False),
+        combinations_json=orjson.dumps(body.combinations).decode("utf-8"),
     )
     db.add(d)
     db.commit()
@@ -87,7 +87,7 @@ def create_draft(body: DraftCreateIn, db: Session = Depends(get_db), user: User
         id=d.id,
         name=d.name,
         team_id=d.team_id,
-        combinations=json.loads(d.combinations_json),
+        combinations=body.combinations,
         created_at=d.created_at.isoformat(),
         updated_at=d.updated_at.isoformat(),
     )
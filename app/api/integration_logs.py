@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
+from datetime import datetime
+from typing import Any
 
+import orjson
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from sqlalchemy.orm import Session, raiseload
 
 from app.api.auth import get_current_user
 from app.api.teams import require_role
@@ -15,7 +17,13 @@ from app.db.session import get_db
 router = APIRouter(prefix="/teams", tags=["Team Integrations"])
 
 
+def _isoformat(v: Any) -> Any:
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
 class ExternalRequestOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     suite_run_id: str
     api_key_id: str
@@ -23,11 +31,26 @@ class ExternalRequestOut(BaseModel):
     webhook_url: str | None
     remote_addr: str | None
     user_agent: str | None
-    context: dict | None
+    # ORM row에서는 request_context_json(JSON 문자열)을 읽어 파싱
+    context: dict | None = Field(default=None, validation_alias=AliasChoices("context", "request_context_json"))
     created_at: str
 
+    @field_validator("context", mode="before")
+    @classmethod
+    def _parse_context(cls, v: Any) -> Any:
+        if isinstance(v, (str, bytes)):
+            try:
+                v = orjson.loads(v)
+            except orjson.JSONDecodeError:
+                return None
+        return v if isinstance(v, dict) else None
+
+    _created_at = field_validator("created_at", mode="before")(_isoformat)
+
 
 class WebhookDeliveryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     suite_run_id: str
     attempt: int
@@ -37,6 +60,13 @@ class WebhookDeliveryOut(BaseModel):
     delivered_at: str | None
     created_at: str
 
+    _timestamps = field_validator("delivered_at", "created_at", mode="before")(_isoformat)
+
+
+# 목록 응답은 ORM row 리스트를 pydantic-core에서 한 번에 변환
+_EXTERNAL_REQUESTS_ADAPTER = TypeAdapter(list[ExternalRequestOut])
+_WEBHOOK_DELIVERIES_ADAPTER = TypeAdapter(list[WebhookDeliveryOut])
+
 
 @router.get(
     "/{team_id}/integrations/external-requests",
@@ -47,33 +77,13 @@ def list_external_requests(team_id: str, db: Session = Depends(get_db), user: Us
     require_role(db, team_id=team_id, user_id=user.id, allow={TeamRole.OWNER.value})
     rows = (
         db.query(ExternalSuiteRequestLog)
+        .options(raiseload("*"))
         .filter(ExternalSuiteRequestLog.team_id == team_id)
         .order_by(ExternalSuiteRequestLog.created_at.desc())
         .limit(200)
         .all()
     )
-    out: list[ExternalRequestOut] = []
-    for r in rows:
-        ctx = None
-        if r.request_context_json:
-            try:
-                ctx = json.loads(r.request_context_json)
-            except Exception:
-                ctx = None
-        out.append(
-            ExternalRequestOut(
-                id=r.id,
-                suite_run_id=r.suite_run_id,
-                api_key_id=r.api_key_id,
-                idempotency_key=r.idempotency_key,
-                webhook_url=r.webhook_url,
-                remote_addr=r.remote_addr,
-                user_agent=r.user_agent,
-                context=ctx,
-                created_at=r.created_at.isoformat(),
-            )
-        )
-    return out
+    return _EXTERNAL_REQUESTS_ADAPTER.validate_python(rows, from_attributes=True)
 
 
 @router.get(
@@ -85,23 +95,12 @@ def list_webhook_deliveries(team_id: str, db: Session = Depends(get_db), user: U
     require_role(db, team_id=team_id, user_id=user.id, allow={TeamRole.OWNER.value})
     rows = (
         db.query(WebhookDeliveryLog)
+        .options(raiseload("*"))
         .filter(WebhookDeliveryLog.team_id == team_id)
         .order_by(WebhookDeliveryLog.created_at.desc())
         .limit(200)
         .all()
     )
-    return [
-        WebhookDeliveryOut(
-            id=r.id,
-            suite_run_id=r.suite_run_id,
-            attempt=int(r.attempt),
-            url=r.url,
-            status_code=r.status_code,
-            error_message=r.error_message,
-            delivered_at=r.delivered_at.isoformat() if r.delivered_at else None,
-            created_at=r.created_at.isoformat(),
-        )
-        for r in rows
-    ]
+    return _WEBHOOK_DELIVERIES_ADAPTER.validate_python(rows, from_attributes=True)
 
 
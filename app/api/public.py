@@ -1,71 +1,128 @@
 from __future__ import annotations
 
-import json
+import functools
+import logging
 import os
+import re
 import secrets
+import threading
 import uuid
 import base64
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from hashlib import sha256
 from hmac import compare_digest
 from pathlib import Path
 from typing import Any
 
+import orjson
+from cachetools import TTLCache
+from celery import chain
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.security import verify_and_update_api_key_secret
 from app.db.models import ExternalSuiteRequestLog, Scenario, SuiteCase, SuiteCaseScenario, SuiteRun, SuiteStatus, TeamApiKey
 from app.db.session import get_db
+from app.runner.scenario import load_scenario
 from app.tasks_suite import execute_suite_case, finalize_suite_run
 from app.core.auth_state_store import validate_storage_state_dict
+from app.core.storage import write_case_dirs
 
 
 router = APIRouter(prefix="/public/v1", tags=["Public API"])
+logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True, slots=True)
+class ApiKeyPrincipal:
+    """인증된 API Key(엔드포인트가 쓰는 필드만). ORM 객체가 아니므로 prefix/name/revoked_at 등은 없습니다."""
 
-def _hash_secret(secret: str) -> str:
-    return sha256(secret.encode("utf-8")).hexdigest()
+    id: str
+    team_id: str
+    created_by_user_id: str
+
+
+# 인증된 API Key 캐시: prefix -> (전체 토큰 bytes, ApiKeyPrincipal)
+# hit이면 토큰 전체를 compare_digest로 비교만 하고 해시 검증/DB 조회를 모두 생략합니다.
+# 폐기는 invalidate_team_api_key_cache로 이 프로세스에서 즉시 반영되지만, 캐시는 프로세스별이므로
+# 다른 API 워커 프로세스에서는 폐기된 키가 최대 _KEY_CACHE_TTL_SECONDS 동안 계속 통과할 수 있습니다.
+_KEY_CACHE_TTL_SECONDS = 60
+_KEY_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=_KEY_CACHE_TTL_SECONDS)
+_key_cache_lock = threading.Lock()
+
+
+# dubbi_sk_<prefix>_<secret>: prefix에는 '_'가 없고, secret은 나머지 전부
+_API_KEY_RE = re.compile(r"dubbi_sk_([^_]+)_(.+)", re.DOTALL)
 
 
 def _parse_api_key(raw: str) -> tuple[str, str]:
     """
     Token format: dubbi_sk_<prefix>_<secret>
     """
-    raw = (raw or "").strip()
-    if not raw.startswith("dubbi_sk_"):
-        raise ValueError("invalid key format")
-    parts = raw.split("_", 3)
-    # ["dubbi", "sk", "<prefix>", "<secret>"]
-    if len(parts) != 4:
-        raise ValueError("invalid key format")
-    prefix = parts[2]
-    secret = parts[3]
-    if not prefix or not secret:
+    m = _API_KEY_RE.fullmatch((raw or "").strip())
+    if not m:
         raise ValueError("invalid key format")
-    return prefix, secret
+    return m.group(1), m.group(2)
+
+
+def invalidate_team_api_key_cache(prefix: str) -> None:
+    """폐기된 키를 이 프로세스의 캐시에서 제거(다른 프로세스는 TTL 만료 시 반영)"""
+    with _key_cache_lock:
+        _KEY_CACHE.pop(prefix, None)
+
+
+def _upgrade_api_key_hash(db: Session, api_key_id: str, new_hash: str) -> None:
+    # legacy row -> current hash (best-effort). 인증 직후 요청 세션에는 아직 쓰기가 없으므로 같은 세션에서 바로 커밋합니다.
+    try:
+        db.execute(update(TeamApiKey).where(TeamApiKey.id == api_key_id).values(secret_hash=new_hash))
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("api key hash upgrade failed: api_key_id=%s", api_key_id)
 
 
 def get_team_api_key(
     x_api_key: str | None = Header(default=None, alias="X-Api-Key"),
     db: Session = Depends(get_db),
-) -> TeamApiKey:
+) -> ApiKeyPrincipal:
     if not x_api_key:
         raise HTTPException(status_code=401, detail="X-Api-Key is required")
     try:
         prefix, secret = _parse_api_key(x_api_key)
     except Exception:
         raise HTTPException(status_code=401, detail="invalid api key") from None
+    token = x_api_key.strip().encode("utf-8")
+
+    with _key_cache_lock:
+        cached = _KEY_CACHE.get(prefix)
+    if cached is not None:
+        cached_token, principal = cached
+        if compare_digest(cached_token, token):
+            return principal
+        raise HTTPException(status_code=401, detail="invalid api key")
 
     key = db.query(TeamApiKey).filter(TeamApiKey.prefix == prefix).first()
     if not key or key.revoked_at is not None:
         raise HTTPException(status_code=401, detail="invalid api key")
 
-    if not compare_digest(key.secret_hash, _hash_secret(secret)):
+    valid, new_hash = verify_and_update_api_key_secret(secret, key.secret_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="invalid api key")
-    return key
+    if new_hash:
+        _upgrade_api_key_hash(db, key.id, new_hash)
+    principal = ApiKeyPrincipal(id=key.id, team_id=key.team_id, created_by_user_id=key.created_by_user_id)
+    with _key_cache_lock:
+        _KEY_CACHE[prefix] = (token, principal)
+    return principal
+
+
+def _uuid4_batch(n: int) -> list[str]:
+    """n random UUID4 strings (same dashed format as ``str(uuid.uuid4())`` used by the models)."""
+    rnd = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=rnd[i : i + 16], version=4)) for i in range(0, 16 * n, 16)]
 
 
 class PublicSuiteCreateIn(BaseModel):
@@ -110,19 +167,25 @@ class PublicSuiteOut(BaseModel):
     webhook_delivered_at: str | None
 
 
+@functools.cache
+def _public_base_url() -> str:
+    # settings are loaded once at import; strip the trailing slash once as well
+    return settings.PUBLIC_BASE_URL.rstrip("/")
+
+
 def _public_status_url(suite_id: str) -> str:
-    return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/public/v1/suite-runs/{suite_id}"
+    return f"{_public_base_url()}/public/v1/suite-runs/{suite_id}"
 
 
 def _public_report_url(suite_id: str) -> str:
-    return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/public/v1/suite-runs/{suite_id}/report.pdf"
+    return f"{_public_base_url()}/public/v1/suite-runs/{suite_id}/report.pdf"
 
 
 @router.post("/suite-runs", response_model=PublicSuiteCreated, summary="(CI/CD) Suite Run 실행 요청(비동기)")
 def public_create_suite_run(
     request: Request,
     body: PublicSuiteCreateIn,
-    api_key: TeamApiKey = Depends(get_team_api_key),
+    api_key: ApiKeyPrincipal = Depends(get_team_api_key),
     idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
 ):
@@ -150,7 +213,7 @@ def public_create_suite_run(
                         api_key_id=api_key.id,
                         suite_run_id=existing.id,
                         idempotency_key=idempotency_key,
-                        request_context_json=json.dumps(body.context, ensure_ascii=False) if body.context else None,
+                        request_context_json=orjson.dumps(body.context).decode("utf-8") if body.context else None,
                         webhook_url=body.webhook_url,
                         remote_addr=request.client.host if request.client else None,
                         user_agent=request.headers.get("user-agent"),
@@ -167,24 +230,40 @@ def public_create_suite_run(
                 idempotency_key=idempotency_key,
             )
 
-    suite_id = str(uuid.uuid4())
+    # Resolve every referenced scenario with one IN query (not one SELECT per id),
+    # and validate before anything is persisted.
+    scenario_ids = {sid for combo in body.combinations for sid in combo}
+    scenarios_by_id = {sc.id: sc for sc in db.query(Scenario).filter(Scenario.id.in_(scenario_ids)).all()}
+    for combo in body.combinations:
+        for sid in combo:
+            sc = scenarios_by_id.get(sid)
+            if not sc:
+                raise HTTPException(status_code=404, detail=f"scenario not found: {sid}")
+            if sc.owner_team_id != body.team_id:
+                raise HTTPException(status_code=403, detail=f"scenario not in target team: {sid}")
+
+    # suite + case IDs from a single urandom read (one syscall instead of one per uuid4())
+    suite_id, *case_id_pool = _uuid4_batch(1 + len(body.combinations))
     suite_dir = os.path.join(settings.ARTIFACT_ROOT, "suite", suite_id)
     Path(suite_dir).mkdir(parents=True, exist_ok=True)
 
     # Optional: decode and validate provided storageState (for headless login bypass).
-    storage_state_bytes: bytes | None = None
+    # Decoded once into suite_dir; cases hard-link to that single file below.
     storage_state_rel = None
+    storage_state_src = None
     if body.storage_state_b64:
         try:
-            storage_state_bytes = base64.b64decode(body.storage_state_b64.encode("utf-8"))
-            obj = json.loads(storage_state_bytes.decode("utf-8"))
+            storage_state_bytes = base64.b64decode(body.storage_state_b64)
+            obj = orjson.loads(storage_state_bytes)
             ok, errors = validate_storage_state_dict(obj if isinstance(obj, dict) else {})
             if not ok:
                 raise HTTPException(status_code=400, detail="invalid storage_state_b64:\n" + "\n".join(f"- {e}" for e in errors))
             fname = (body.storage_state_filename or "storage_state.json").strip() or "storage_state.json"
             # keep it simple: avoid path traversal
             fname = os.path.basename(fname)
-            Path(suite_dir, fname).write_bytes(storage_state_bytes)
+            storage_state_src = os.path.join(suite_dir, fname)
+            Path(storage_state_src).write_bytes(storage_state_bytes)
+            del storage_state_bytes, obj
             storage_state_rel = f"./{fname}"
         except HTTPException:
             raise
@@ -197,10 +276,10 @@ def public_create_suite_run(
         team_id=body.team_id,
         status=SuiteStatus.QUEUED.value,
         artifact_dir=suite_dir,
-        submitted_combinations_json=json.dumps(body.combinations, ensure_ascii=False),
+        submitted_combinations_json=orjson.dumps(body.combinations).decode("utf-8"),
         trigger_api_key_id=api_key.id,
         external_idempotency_key=idempotency_key,
-        external_context_json=json.dumps(body.context, ensure_ascii=False) if body.context else None,
+        external_context_json=orjson.dumps(body.context).decode("utf-8") if body.context else None,
         webhook_url=body.webhook_url,
         webhook_secret=body.webhook_secret,
         webhook_attempts=0,
@@ -217,7 +296,7 @@ def public_create_suite_run(
                 api_key_id=api_key.id,
                 suite_run_id=suite.id,
                 idempotency_key=idempotency_key,
-                request_context_json=json.dumps(body.context, ensure_ascii=False) if body.context else None,
+                request_context_json=orjson.dumps(body.context).decode("utf-8") if body.context else None,
                 webhook_url=body.webhook_url,
                 remote_addr=request.client.host if request.client else None,
                 user_agent=request.headers.get("user-agent"),
@@ -229,75 +308,63 @@ def public_create_suite_run(
 
     # Create cases (same as internal create)
     case_ids: list[str] = []
+    cases: list[SuiteCase] = []
+    links: list[SuiteCaseScenario] = []
+    loaded_scenarios: dict[str, Any] = {}
+    case_files: list[tuple[str, str, bytes]] = []
     for idx, combo in enumerate(body.combinations, start=1):
-        scenarios: list[Scenario] = []
-        for sid in combo:
-            sc = db.get(Scenario, sid)
-            if not sc:
-                raise HTTPException(status_code=404, detail=f"scenario not found: {sid}")
-            if sc.owner_team_id != body.team_id:
-                raise HTTPException(status_code=403, detail=f"scenario not in target team: {sid}")
-            scenarios.append(sc)
+        scenarios = [scenarios_by_id[sid] for sid in combo]
 
-        case_id = str(uuid.uuid4())
+        case_id = case_id_pool[idx - 1]
         case_dir = os.path.join(suite_dir, f"case_{idx:03d}_{case_id}")
-        Path(case_dir).mkdir(parents=True, exist_ok=True)
 
         combined_path = os.path.join(case_dir, "combined.json")
-        steps: list[dict[str, Any]] = []
-        combined_base_url = None
+        loaded = []
         for sc in scenarios:
-            from app.runner.scenario import load_scenario
-
-            s = load_scenario(sc.scenario_path)
-            combined_base_url = combined_base_url or s.base_url
-            steps.extend(list(s.steps))
+            s = loaded_scenarios.get(sc.id)
+            if s is None:
+                s = loaded_scenarios[sc.id] = load_scenario(sc.scenario_path)
+            loaded.append(s)
+        # first non-empty base_url wins; steps concatenated in one pass (no per-scenario list copies)
+        combined_base_url = next((s.base_url for s in loaded if s.base_url), None)
+        steps: list[dict[str, Any]] = [step for s in loaded for step in s.steps]
         combined: dict[str, Any] = {"base_url": combined_base_url or "", "steps": steps}
         if storage_state_rel:
-            # copy into each case dir for execution isolation
-            try:
-                fname = storage_state_rel.replace("./", "", 1)
-                src = Path(suite_dir) / fname
-                dst = Path(case_dir) / fname
-                if src.exists() and not dst.exists():
-                    dst.write_bytes(src.read_bytes())
-            except Exception:
-                pass
             combined["requires_auth"] = True
             combined["storage_state_path"] = storage_state_rel
-        Path(combined_path).write_text(json.dumps(combined, ensure_ascii=False, indent=2), encoding="utf-8")
-
-        case = SuiteCase(
-            id=case_id,
-            suite_run_id=suite.id,
-            case_index=idx,
-            status=SuiteStatus.QUEUED.value,
-            artifact_dir=case_dir,
-            combined_scenario_path=combined_path,
+        case_files.append(
+            (case_dir, combined_path, orjson.dumps(combined, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         )
-        db.add(case)
-        db.flush()
-
-        for order_i, sc in enumerate(scenarios, start=1):
-            db.add(SuiteCaseScenario(suite_case_id=case.id, scenario_id=sc.id, order_index=order_i))
 
+        cases.append(
+            SuiteCase(
+                id=case_id,
+                suite_run_id=suite.id,
+                case_index=idx,
+                status=SuiteStatus.QUEUED.value,
+                artifact_dir=case_dir,
+                combined_scenario_path=combined_path,
+            )
+        )
+        links.extend(
+            SuiteCaseScenario(suite_case_id=case_id, scenario_id=sc.id, order_index=order_i)
+            for order_i, sc in enumerate(scenarios, start=1)
+        )
         case_ids.append(case_id)
 
+    write_case_dirs(case_files, storage_state_src=storage_state_src)
+
+    db.add_all(cases)
+    db.add_all(links)
     db.commit()
 
     # Queue execution: 순차 실행 (안정화를 위해 병렬 실행 비활성화)
-    from celery import chain
-    
-    # 순차 실행 체인 생성
+    # 순차 실행 체인 생성 (`|` 반복 대신 signature 리스트로 한 번에 구성)
     if case_ids:
-        # 첫 번째 케이스부터 시작
-        job_chain = execute_suite_case.s(case_ids[0])
-        # 나머지 케이스들을 체인으로 연결
-        for cid in case_ids[1:]:
-            job_chain = job_chain | execute_suite_case.s(cid)
+        sigs = [execute_suite_case.s(cid) for cid in case_ids]
         # 마지막에 finalize 추가 (chain의 마지막 결과를 무시하고 suite_id만 전달)
-        job_chain = job_chain | finalize_suite_run.si(suite_id)
-        job_chain.apply_async()
+        sigs.append(finalize_suite_run.si(suite_id))
+        chain(*sigs).apply_async()
     else:
         # 케이스가 없으면 바로 finalize
         finalize_suite_run.delay(suite_id)
@@ -314,21 +381,27 @@ def public_create_suite_run(
 @router.get("/suite-runs/{suite_run_id}", response_model=PublicSuiteOut, summary="(CI/CD) Suite Run 상태 조회")
 def public_get_suite_run(
     suite_run_id: str,
-    api_key: TeamApiKey = Depends(get_team_api_key),
+    api_key: ApiKeyPrincipal = Depends(get_team_api_key),
     db: Session = Depends(get_db),
 ):
     suite = db.get(SuiteRun, suite_run_id)
     if not suite or suite.trigger_api_key_id != api_key.id:
         raise HTTPException(status_code=404, detail="suite run not found")
 
-    cases = db.query(SuiteCase).filter(SuiteCase.suite_run_id == suite.id).all()
-    passed = sum(1 for c in cases if c.status == SuiteStatus.PASSED.value)
-    failed = sum(1 for c in cases if c.status == SuiteStatus.FAILED.value)
+    # 케이스 row 전체 대신 상태별 개수만 집계
+    counts = dict(
+        db.query(SuiteCase.status, func.count())
+        .filter(SuiteCase.suite_run_id == suite.id)
+        .group_by(SuiteCase.status)
+        .all()
+    )
+    passed = counts.get(SuiteStatus.PASSED.value, 0)
+    failed = counts.get(SuiteStatus.FAILED.value, 0)
 
     ctx = None
     if suite.external_context_json:
         try:
-            ctx = json.loads(suite.external_context_json)
+            ctx = orjson.loads(suite.external_context_json)
         except Exception:
             ctx = None
 
@@ -338,7 +411,7 @@ def public_get_suite_run(
         created_at=suite.created_at.isoformat(),
         started_at=suite.started_at.isoformat() if suite.started_at else None,
         finished_at=suite.finished_at.isoformat() if suite.finished_at else None,
-        case_count=len(cases),
+        case_count=sum(counts.values()),
         passed_cases=passed,
         failed_cases=failed,
         report_url=_public_report_url(suite.id),
@@ -354,15 +427,17 @@ def public_get_suite_run(
 @router.get("/suite-runs/{suite_run_id}/report.pdf", summary="(CI/CD) Suite Run 리포트 PDF 다운로드")
 def public_download_suite_report(
     suite_run_id: str,
-    api_key: TeamApiKey = Depends(get_team_api_key),
+    api_key: ApiKeyPrincipal = Depends(get_team_api_key),
     db: Session = Depends(get_db),
 ):
     suite = db.get(SuiteRun, suite_run_id)
     if not suite or suite.trigger_api_key_id != api_key.id:
         raise HTTPException(status_code=404, detail="suite run not found")
     pdf_path = Path(suite.artifact_dir) / "suite_report.pdf"
-    if not pdf_path.exists():
+    try:
+        pdf_stat = pdf_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="report not ready")
-    return FileResponse(path=str(pdf_path), filename="suite_report.pdf")
+    return FileResponse(path=str(pdf_path), filename="suite_report.pdf", stat_result=pdf_stat)
 
 
@@ -1,40 +1,52 @@
 from __future__ import annotations
 
-import json
 import os
+import re
 import uuid
-from pathlib import Path
-from typing import Any, Literal
+from collections.abc import Callable
+from itertools import groupby
+from typing import Annotated, Any, Literal
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi import Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from typing_extensions import Required, TypedDict
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
 from app.core.config import settings
+from app.core.storage import ensure_dir, write_file_bytes
 from app.db.models import Scenario, User
 from app.db.session import get_db
 from app.runner.scenario_compiler import compile_scenario
 
 
-router = APIRouter(prefix="/recordings", tags=["recordings"])
+router = APIRouter(prefix="/recordings", tags=["recordings"], default_response_class=ORJSONResponse)
 
 
-class RecordingEvent(BaseModel):
-    kind: Literal["action", "assert"] = Field(..., description="이벤트 종류(action/assert)")
-    type: str = Field(..., description="이벤트 타입(click/input/navigate/assert_text/assert_visible/assert_url 등)")
-    selector: str | None = None
-    url: str | None = None
-    text: str | None = None
-    value: str | None = None
+class RecordingEvent(TypedDict, total=False):
+    """
+    레코더 이벤트 1건. 이벤트 수가 많아(키 입력마다 1건) 모델 인스턴스 대신
+    pydantic-core가 바로 dict로 검증하도록 TypedDict로 정의합니다.
+    """
+
+    kind: Required[Annotated[Literal["action", "assert"], Field(description="이벤트 종류(action/assert)")]]
+    type: Required[
+        Annotated[str, Field(description="이벤트 타입(click/input/navigate/assert_text/assert_visible/assert_url 등)")]
+    ]
+    selector: str | None
+    url: str | None
+    text: str | None
+    value: str | None
     # Optional meta from advanced recorder (ignored by older clients)
-    id: str | None = None
-    ts: int | None = None
-    delay: int | None = Field(None, description="(ms) 다음 스텝까지 기다릴 시간")
-    frame: dict[str, Any] | None = Field(
-        None, description="(선택) 프레임 메타 {href,name,isTop} - iframe 이벤트 실행에 사용"
-    )
+    id: str | None
+    ts: int | None
+    delay: Annotated[int | None, Field(description="(ms) 다음 스텝까지 기다릴 시간")]
+    frame: Annotated[
+        dict[str, Any] | None, Field(description="(선택) 프레임 메타 {href,name,isTop} - iframe 이벤트 실행에 사용")
+    ]
 
 
 class RecordingToScenarioIn(BaseModel):
@@ -63,101 +75,139 @@ def recordings_to_scenario_preflight() -> Response:
 
 
 def _ensure_dirs() -> None:
-    Path(settings.SCENARIO_ROOT).mkdir(parents=True, exist_ok=True)
+    ensure_dir(settings.SCENARIO_ROOT)
+
+
+_FILL_TYPES = frozenset({"input", "fill"})
+
+
+def _collapse_fill_runs(events: list[RecordingEvent]) -> list[tuple[RecordingEvent, str | None, int]]:
+    """
+    Pre-pass: recorder emits one input event per keystroke. Collapse each run of consecutive
+    fill/input events on the same selector into one ``(first_event, last_value, delay_ms)`` entry
+    (delay_ms = last non-zero delay in the run), so the main loop sees one entry per field edit.
+    """
+    out: list[tuple[RecordingEvent, str | None, int]] = []
+    for (is_fill, _selector), group in groupby(
+        events, key=lambda e: (e["type"] in _FILL_TYPES and e.get("selector") is not None, e.get("selector"))
+    ):
+        if not is_fill:
+            out.extend((ev, ev.get("value"), int(ev.get("delay") or 0)) for ev in group)
+            continue
+        first = next(group)
+        value, delay_ms = first.get("value"), int(first.get("delay") or 0)
+        for ev in group:
+            value = ev.get("value")
+            if ev.get("delay"):
+                delay_ms = int(ev["delay"])
+        out.append((first, value, delay_ms))
+    return out
+
+
+def _step(s: dict[str, Any], ev: RecordingEvent, delay_ms: int) -> dict[str, Any]:
+    if delay_ms:
+        s["delay_ms"] = delay_ms
+    frame = ev.get("frame")
+    if frame:
+        s["frame"] = frame
+    return s
+
+
+def _h_navigate(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    if ev.get("url"):
+        steps.append(_step({"type": "go", "url": ev["url"]}, ev, delay_ms))
+
+
+def _h_click(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    if ev.get("selector"):
+        steps.append(_step({"type": "click", "selector": ev["selector"]}, ev, delay_ms))
+
+
+def _h_click_popup(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    # Click that is expected to open a popup/new page (target=_blank, window.open)
+    if ev.get("selector"):
+        s: dict[str, Any] = {"type": "click_popup", "selector": ev["selector"]}
+        if ev.get("url"):
+            s["popup_url"] = ev["url"]
+        steps.append(_step(s, ev, delay_ms))
+
+
+def _h_popup_open(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    # Some sites open popup programmatically (window.open). Open a new page and goto url.
+    if ev.get("url"):
+        steps.append(_step({"type": "popup_go", "url": ev["url"]}, ev, delay_ms))
+
+
+def _h_popup_close(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    steps.append({"type": "close_page"})
+
+
+def _h_fill(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    selector = ev.get("selector")
+    if selector is None:
+        return
+    # Keystroke runs are already collapsed by _collapse_fill_runs; this only merges runs that were
+    # split by skipped (unknown/insufficient) events, keeping the latest value for the selector.
+    if steps and steps[-1].get("type") == "fill" and steps[-1].get("selector") == selector:
+        steps[-1]["value"] = value or ""
+        if delay_ms:
+            steps[-1]["delay_ms"] = delay_ms
+    else:
+        steps.append(_step({"type": "fill", "selector": selector, "value": value or ""}, ev, delay_ms))
+
+
+def _h_assert_text(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    if ev.get("selector") and ev.get("text") is not None:
+        steps.append(_step({"type": "expect_text", "selector": ev["selector"], "text": ev["text"]}, ev, delay_ms))
+
+
+def _h_assert_visible(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    if ev.get("selector"):
+        steps.append(_step({"type": "expect_visible", "selector": ev["selector"]}, ev, delay_ms))
+
+
+def _h_assert_url(ev: RecordingEvent, value: str | None, delay_ms: int, steps: list[dict[str, Any]]) -> None:
+    if ev.get("url"):
+        steps.append(_step({"type": "expect_url", "url": ev["url"]}, ev, delay_ms))
+
+
+# 이벤트 type -> step 변환 핸들러 (elif 체인 대신 dict 조회 한 번)
+_HANDLERS: dict[str, Callable[[RecordingEvent, str | None, int, list[dict[str, Any]]], None]] = {
+    "navigate": _h_navigate,
+    "click": _h_click,
+    "click_popup": _h_click_popup,
+    "popup_open": _h_popup_open,
+    "popup_close": _h_popup_close,
+    "input": _h_fill,
+    "fill": _h_fill,
+    "assert_text": _h_assert_text,
+    "assert_visible": _h_assert_visible,
+    "assert_url": _h_assert_url,
+}
 
 
 def _events_to_steps(events: list[RecordingEvent]) -> list[dict[str, Any]]:
     steps: list[dict[str, Any]] = []
-    for ev in events:
-        t = ev.type
-        delay_ms = int(ev.delay or 0)
-        frame = ev.frame
-        if t == "navigate" and ev.url:
-            s: dict[str, Any] = {"type": "go", "url": ev.url}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "click" and ev.selector:
-            s = {"type": "click", "selector": ev.selector}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "click_popup" and ev.selector:
-            # Click that is expected to open a popup/new page (target=_blank, window.open)
-            s = {"type": "click_popup", "selector": ev.selector}
-            if ev.url:
-                s["popup_url"] = ev.url
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "popup_open" and ev.url:
-            # Some sites open popup programmatically (window.open). Open a new page and goto url.
-            s = {"type": "popup_go", "url": ev.url}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "popup_close":
-            steps.append({"type": "close_page"})
-        elif t in ("input", "fill") and ev.selector is not None:
-            # Recorder can emit many input events (per keystroke). Compress by keeping only
-            # the latest value for the same selector until the next non-fill action.
-            if steps and steps[-1].get("type") == "fill" and steps[-1].get("selector") == ev.selector:
-                steps[-1]["value"] = ev.value or ""
-                if delay_ms:
-                    steps[-1]["delay_ms"] = delay_ms
-            else:
-                s = {"type": "fill", "selector": ev.selector, "value": ev.value or ""}
-                if delay_ms:
-                    s["delay_ms"] = delay_ms
-                if frame:
-                    s["frame"] = frame
-                steps.append(s)
-        elif t == "assert_text" and ev.selector and ev.text is not None:
-            s = {"type": "expect_text", "selector": ev.selector, "text": ev.text}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "assert_visible" and ev.selector:
-            s = {"type": "expect_visible", "selector": ev.selector}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        elif t == "assert_url" and ev.url:
-            s = {"type": "expect_url", "url": ev.url}
-            if delay_ms:
-                s["delay_ms"] = delay_ms
-            if frame:
-                s["frame"] = frame
-            steps.append(s)
-        else:
-            # unknown/insufficient event -> skip (MVP)
-            continue
+    for ev, value, delay_ms in _collapse_fill_runs(events):
+        handler = _HANDLERS.get(ev["type"])
+        # unknown event type -> skip (MVP); handlers also skip events missing required fields
+        if handler is not None:
+            handler(ev, value, delay_ms, steps)
     return steps
 
 
+# scheme://netloc 만 필요하므로 urlparse 전체 파싱 대신 정규식 한 번으로 추출
+_BASE_URL_RE = re.compile(r"([a-zA-Z][a-zA-Z0-9+\-.]*)://([^/?#]+)")
+
+
 def _infer_base_url(events: list[RecordingEvent]) -> str | None:
     for ev in events:
-        if ev.type == "navigate" and ev.url:
-            try:
-                from urllib.parse import urlparse
-
-                u = urlparse(ev.url)
-                if u.scheme and u.netloc:
-                    return f"{u.scheme}://{u.netloc}"
-            except Exception:
-                continue
+        if ev["type"] != "navigate":
+            continue
+        m = _BASE_URL_RE.match(ev.get("url") or "")
+        if m:
+            # urlparse와 동일하게 scheme은 소문자로 정규화
+            return f"{m.group(1).lower()}://{m.group(2)}"
     return None
 
 
@@ -182,7 +232,7 @@ def recording_to_scenario(body: RecordingToScenarioIn, db: Session = Depends(get
     _ensure_dirs()
     sid = str(uuid.uuid4())
     path = os.path.join(settings.SCENARIO_ROOT, user.id, f"{sid}.json")
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(os.path.dirname(path))
 
     base_url = body.base_url or _infer_base_url(body.events) or ""
     
@@ -199,13 +249,12 @@ def recording_to_scenario(body: RecordingToScenarioIn, db: Session = Depends(get
     # - 텍스트 기반 locator 추가
     scenario_obj = compile_scenario(raw_scenario)
 
-    Path(path).write_text(json.dumps(scenario_obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_file_bytes(path, orjson.dumps(scenario_obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     sc = Scenario(id=sid, name=body.name.strip(), owner_user_id=user.id, owner_team_id=None, scenario_path=path)
     db.add(sc)
-    db.commit()
-    db.refresh(sc)
-    return ScenarioOut(
+    db.flush()
+    out = ScenarioOut(
         id=sc.id,
         name=sc.name,
         owner_user_id=sc.owner_user_id,
@@ -213,5 +262,7 @@ def recording_to_scenario(body: RecordingToScenarioIn, db: Session = Depends(get
         created_at=sc.created_at.isoformat(),
         updated_at=sc.updated_at.isoformat(),
     )
+    db.commit()
+    return out
 
 
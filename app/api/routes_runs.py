@@ -8,13 +8,15 @@ This router exposes endpoints to:
 """
 
 import os
+import stat
 import time
 import uuid
 from pathlib import Path
 from datetime import datetime, timezone
 
+import orjson
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -30,7 +32,7 @@ from app.core.auth_state_store import copy_auth_state_to_dir
 from app.core.scenario_inject import inject_storage_state_path_into_scenario_file
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class RunCreated(BaseModel):
@@ -151,18 +153,21 @@ def list_my_runs(db: Session = Depends(get_db), user: User = Depends(get_current
         .limit(200)
         .all()
     )
-    return [
-        MyRunOut(
-            id=r.id,
-            status=r.status,
-            created_at=r.created_at.isoformat(),
-            started_at=r.started_at.isoformat() if r.started_at else None,
-            finished_at=r.finished_at.isoformat() if r.finished_at else None,
-            exit_code=r.exit_code,
-            is_deleted=bool(getattr(r, "is_deleted", False)),
-        )
-        for r in rows
-    ]
+    # response_model은 문서용: plain dict를 바로 직렬화
+    return ORJSONResponse(
+        [
+            {
+                "id": r.id,
+                "status": r.status,
+                "created_at": r.created_at,
+                "started_at": r.started_at,
+                "finished_at": r.finished_at,
+                "exit_code": r.exit_code,
+                "is_deleted": bool(getattr(r, "is_deleted", False)),
+            }
+            for r in rows
+        ]
+    )
 
 
 @router.get("/{run_id}", response_model=RunOut)
@@ -181,19 +186,22 @@ def get_run_api(run_id: str, db: Session = Depends(get_db), user: User = Depends
         raise HTTPException(status_code=404, detail="run not found")
     if getattr(run, "is_deleted", False):
         raise HTTPException(status_code=410, detail="run deleted")
-    return RunOut(
-        id=run.id,
-        status=run.status,
-        scenario_path=run.scenario_path,
-        artifact_dir=run.artifact_dir,
-        created_at=run.created_at.isoformat(),
-        started_at=run.started_at.isoformat() if run.started_at else None,
-        finished_at=run.finished_at.isoformat() if run.finished_at else None,
-        exit_code=run.exit_code,
-        error_message=run.error_message,
-        is_deleted=getattr(run, "is_deleted", False),
-        deleted_at=run.deleted_at.isoformat() if getattr(run, "deleted_at", None) else None,
-        deleted_artifact_dir=getattr(run, "deleted_artifact_dir", None),
+    # Response를 직접 반환하면 response_model 검증/jsonable_encoder를 건너뜀(response_model은 문서용)
+    return ORJSONResponse(
+        {
+            "id": run.id,
+            "status": run.status,
+            "scenario_path": run.scenario_path,
+            "artifact_dir": run.artifact_dir,
+            "created_at": run.created_at,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+            "exit_code": run.exit_code,
+            "error_message": run.error_message,
+            "is_deleted": getattr(run, "is_deleted", False),
+            "deleted_at": getattr(run, "deleted_at", None),
+            "deleted_artifact_dir": getattr(run, "deleted_artifact_dir", None),
+        }
     )
 
 
@@ -213,17 +221,20 @@ def list_artifacts(run_id: str, db: Session = Depends(get_db), user: User = Depe
     if getattr(run, "is_deleted", False):
         raise HTTPException(status_code=410, detail="run deleted")
 
-    run_dir = Path(run.artifact_dir)
-    if not run_dir.exists():
-        return []
+    run_dir = run.artifact_dir
+    if not os.path.isdir(run_dir):
+        return ORJSONResponse([])
 
-    items: list[ArtifactInfo] = []
-    for p in run_dir.iterdir():
-        if p.is_file():
-            st = p.stat()
-            items.append(ArtifactInfo(name=p.name, size=st.st_size, mtime_epoch=int(st.st_mtime)))
-    items.sort(key=lambda x: x.mtime_epoch)
-    return items
+    # scandir: is_file()은 d_type으로 판단하므로 파일당 stat은 1회(크기/mtime)만 발생
+    items: list[dict] = []
+    with os.scandir(run_dir) as it:
+        for e in it:
+            if e.is_file():
+                st = e.stat()
+                items.append({"name": e.name, "size": st.st_size, "mtime_epoch": int(st.st_mtime)})
+    # mtime 오름차순 정렬은 기존 응답 계약: 전체 목록이 있어야 하므로 스트리밍하지 않고 한 번에 응답
+    items.sort(key=lambda x: x["mtime_epoch"])
+    return ORJSONResponse(items)
 
 
 @router.get("/{run_id}/artifacts/{name}")
@@ -243,17 +254,27 @@ def download_artifact(run_id: str, name: str, db: Session = Depends(get_db), use
     if getattr(run, "is_deleted", False):
         raise HTTPException(status_code=410, detail="run deleted")
 
-    run_dir = Path(run.artifact_dir).resolve()
-    target = (run_dir / name).resolve()
-
-    # Path Traversal 방지: target이 run_dir 밖이면 거부
-    if run_dir not in target.parents and run_dir != target:
+    # Path Traversal 방지: name은 run_dir 바로 아래의 단일 파일명만 허용 (realpath 없이 문자열로 검사)
+    safe_name = os.path.normpath(name)
+    if safe_name in (os.curdir, os.pardir) or os.path.isabs(safe_name) or os.sep in safe_name or (os.altsep and os.altsep in safe_name):
         raise HTTPException(status_code=400, detail="invalid artifact path")
+    target = os.path.join(run.artifact_dir, safe_name)
 
-    if not target.exists() or not target.is_file():
+    # 일반 파일은 lstat 1회로 끝. symlink만 realpath로 run_dir 안을 가리키는지 확인한 뒤 따라감(기존 동작 유지)
+    try:
+        st = os.lstat(target)
+        if stat.S_ISLNK(st.st_mode):
+            run_dir = os.path.realpath(run.artifact_dir)
+            if os.path.commonpath([run_dir, os.path.realpath(target)]) != run_dir:
+                raise HTTPException(status_code=400, detail="invalid artifact path")
+            st = os.stat(target)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise HTTPException(status_code=404, detail="artifact not found")
 
-    return FileResponse(path=str(target), filename=target.name)
+    # 이미 구한 stat을 넘겨 FileResponse의 os.stat(스레드 hop 포함)을 생략
+    return FileResponse(path=target, filename=safe_name, stat_result=st)
 
 
 @router.get("/{run_id}/report.pdf")
@@ -289,7 +310,11 @@ def download_report_pdf(
         raise HTTPException(status_code=404, detail="artifact dir not found")
 
     pdf_path = run_dir / "report.pdf"
-    if refresh or not pdf_path.exists():
+    try:
+        pdf_stat = None if refresh else pdf_path.stat()
+    except FileNotFoundError:
+        pdf_stat = None
+    if pdf_stat is None:
         generate_run_report_pdf(
             run_id=run.id,
             status=run.status,
@@ -303,8 +328,9 @@ def download_report_pdf(
             debug=debug,
             output_path=str(pdf_path),
         )
+        pdf_stat = pdf_path.stat()
 
-    return FileResponse(path=str(pdf_path), filename="report.pdf")
+    return FileResponse(path=str(pdf_path), filename="report.pdf", stat_result=pdf_stat)
 
 
 @router.delete(
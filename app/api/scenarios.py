@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
+import shutil
 import uuid
 from pathlib import Path
 
+import orjson
+import yaml
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
 from app.core.config import settings
+from app.core.storage import ensure_dir, write_file_atomic, write_file_bytes
 from app.db.models import Scenario, TeamMember, TeamRole, User
 from app.db.session import get_db
 from app.runner.scenario_validator import validate_scenario, get_scenario_schema_example
 
 
-router = APIRouter(prefix="/scenarios", tags=["scenarios"])
+# libyaml(C) 로더 우선, 없으면 순수 Python SafeLoader (safe_load와 동일한 안전 로더)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+router = APIRouter(prefix="/scenarios", tags=["scenarios"], default_response_class=ORJSONResponse)
 
 
 class ScenarioOut(BaseModel):
@@ -50,7 +58,7 @@ class ScenarioValidationOut(BaseModel):
 
 
 def _ensure_dirs() -> None:
-    Path(settings.SCENARIO_ROOT).mkdir(parents=True, exist_ok=True)
+    ensure_dir(settings.SCENARIO_ROOT)
 
 
 def _require_team_role(db: Session, *, team_id: str, user_id: str, allow: set[str]) -> TeamMember:
@@ -64,45 +72,18 @@ def _require_team_role(db: Session, *, team_id: str, user_id: str, allow: set[st
     return m
 
 
-@router.post("", response_model=ScenarioOut)
-async def upload_my_scenario(
-    name: str,
-    scenario: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
-    """
-    ## 내 시나리오 업로드
-
-    - **권한**: 로그인 필요(Bearer JWT)
-    - **요청**:
-      - Query: `name` (시나리오 이름)
-      - Multipart: `scenario` 파일(.yaml/.yml/.json)
-    - **처리**:
-      - 파일을 `SCENARIO_ROOT/{user_id}/{scenario_id}.(yaml|json)`에 저장
-      - DB에 Scenario row 생성(owner_user_id=user)
-    - **응답**: Scenario 메타데이터
-    - **에러**:
-      - 400: 빈 파일
-      - 401: 인증 실패
-    """
+def _save_uploaded_scenario(db: Session, *, user_id: str, name: str, ext: str, content: bytes) -> ScenarioOut:
     _ensure_dirs()
     sid = str(uuid.uuid4())
-    filename = scenario.filename or "scenario.yaml"
-    ext = os.path.splitext(filename)[1].lower() or ".yaml"
-    path = os.path.join(settings.SCENARIO_ROOT, user.id, f"{sid}{ext}")
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    content = await scenario.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="empty scenario file")
+    path = os.path.join(settings.SCENARIO_ROOT, user_id, f"{sid}{ext}")
+    ensure_dir(os.path.dirname(path))
     
     # 파일 내용 파싱 및 검증
     try:
         if ext == ".json":
-            scenario_dict = json.loads(content.decode("utf-8"))
+            scenario_dict = orjson.loads(content)
         else:
-            import yaml
-            scenario_dict = yaml.safe_load(content.decode("utf-8"))
+            scenario_dict = yaml.load(content, Loader=_YAML_LOADER)
         
         # 검증 수행
         is_valid, errors = validate_scenario(scenario_dict)
@@ -111,18 +92,18 @@ async def upload_my_scenario(
             raise HTTPException(status_code=400, detail=error_msg)
     except HTTPException:
         raise
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"JSON 파싱 오류: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"시나리오 파싱 오류: {str(e)}")
     
-    with open(path, "wb") as f:
-        f.write(content)
-    sc = Scenario(id=sid, name=name, owner_user_id=user.id, owner_team_id=None, scenario_path=path)
+    write_file_bytes(path, content)
+    sc = Scenario(id=sid, name=name, owner_user_id=user_id, owner_team_id=None, scenario_path=path)
     db.add(sc)
-    db.commit()
-    db.refresh(sc)
-    return ScenarioOut(
+    # flush는 INSERT ... RETURNING으로 server default(created_at/updated_at)까지 받아옴:
+    # commit 전에 응답을 만들어 두면 commit 후 refresh(SELECT)가 필요 없음
+    db.flush()
+    out = ScenarioOut(
         id=sc.id,
         name=sc.name,
         owner_user_id=sc.owner_user_id,
@@ -130,6 +111,39 @@ async def upload_my_scenario(
         created_at=sc.created_at.isoformat(),
         updated_at=sc.updated_at.isoformat(),
     )
+    db.commit()
+    return out
+
+
+@router.post("", response_model=ScenarioOut)
+async def upload_my_scenario(
+    name: str,
+    scenario: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    ## 내 시나리오 업로드
+
+    - **권한**: 로그인 필요(Bearer JWT)
+    - **요청**:
+      - Query: `name` (시나리오 이름)
+      - Multipart: `scenario` 파일(.yaml/.yml/.json)
+    - **처리**:
+      - 파일을 `SCENARIO_ROOT/{user_id}/{scenario_id}.(yaml|json)`에 저장
+      - DB에 Scenario row 생성(owner_user_id=user)
+    - **응답**: Scenario 메타데이터
+    - **에러**:
+      - 400: 빈 파일
+      - 401: 인증 실패
+    """
+    filename = scenario.filename or "scenario.yaml"
+    ext = os.path.splitext(filename)[1].lower() or ".yaml"
+    content = await scenario.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="empty scenario file")
+    # 파싱/검증, 파일 쓰기, DB commit은 블로킹 작업이라 이벤트 루프 밖(스레드)에서 수행
+    return await asyncio.to_thread(_save_uploaded_scenario, db, user_id=user.id, name=name, ext=ext, content=content)
 
 
 @router.get("/me", response_model=list[ScenarioOut])
@@ -141,17 +155,20 @@ def list_my_scenarios(db: Session = Depends(get_db), user: User = Depends(get_cu
     - **처리**: `owner_user_id == me.id`인 시나리오만 반환
     """
     rows = db.query(Scenario).filter(Scenario.owner_user_id == user.id).order_by(Scenario.created_at.desc()).all()
-    return [
-        ScenarioOut(
-            id=s.id,
-            name=s.name,
-            owner_user_id=s.owner_user_id,
-            owner_team_id=s.owner_team_id,
-            created_at=s.created_at.isoformat(),
-            updated_at=s.updated_at.isoformat(),
-        )
-        for s in rows
-    ]
+    # response_model은 문서용: plain dict를 바로 직렬화
+    return ORJSONResponse(
+        [
+            {
+                "id": s.id,
+                "name": s.name,
+                "owner_user_id": s.owner_user_id,
+                "owner_team_id": s.owner_team_id,
+                "created_at": s.created_at,
+                "updated_at": s.updated_at,
+            }
+            for s in rows
+        ]
+    )
 
 
 @router.post("/{scenario_id}/publish", response_model=ScenarioOut)
@@ -186,8 +203,9 @@ def publish_to_team(
     ext = src_path.suffix or ".yaml"
     _ensure_dirs()
     dest_path = os.path.join(settings.SCENARIO_ROOT, "teams", body.team_id, f"{sid}{ext}")
-    Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
-    Path(dest_path).write_bytes(src_path.read_bytes())
+    ensure_dir(os.path.dirname(dest_path))
+    # kernel-side copy (sendfile/copy_file_range); 원본은 이후 편집될 수 있으므로 hard link는 사용하지 않음
+    shutil.copyfile(src_path, dest_path)
 
     sc = Scenario(
         id=sid,
@@ -198,9 +216,8 @@ def publish_to_team(
         source_scenario_id=src.id,
     )
     db.add(sc)
-    db.commit()
-    db.refresh(sc)
-    return ScenarioOut(
+    db.flush()
+    out = ScenarioOut(
         id=sc.id,
         name=sc.name,
         owner_user_id=sc.owner_user_id,
@@ -208,6 +225,8 @@ def publish_to_team(
         created_at=sc.created_at.isoformat(),
         updated_at=sc.updated_at.isoformat(),
     )
+    db.commit()
+    return out
 
 
 @router.delete(
@@ -259,10 +278,11 @@ def get_my_scenario_content(scenario_id: str, db: Session = Depends(get_db), use
     if p.suffix.lower() != ".json":
         raise HTTPException(status_code=400, detail="only .json scenario is supported for content API (MVP)")
     try:
-        content = json.loads(p.read_text(encoding="utf-8"))
+        content = orjson.loads(p.read_bytes())
     except Exception:
         raise HTTPException(status_code=400, detail="failed to parse scenario json")
-    return ScenarioContentOut(id=sc.id, name=sc.name, content=content)
+    # content는 파일에서 읽은 임의 JSON: response_model로 재검증/인코딩하지 않고 orjson으로 바로 응답
+    return ORJSONResponse({"id": sc.id, "name": sc.name, "content": content})
 
 
 @router.post(
@@ -316,9 +336,9 @@ def update_my_scenario_content(
     p = Path(sc.scenario_path)
     if p.suffix.lower() != ".json":
         raise HTTPException(status_code=400, detail="only .json scenario is supported for content API (MVP)")
-    p.write_text(json.dumps(body.content, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_file_atomic(str(p), orjson.dumps(body.content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     db.commit()  # updated_at onupdate
     db.refresh(sc)
-    return ScenarioContentOut(id=sc.id, name=sc.name, content=body.content)
+    return ORJSONResponse({"id": sc.id, "name": sc.name, "content": body.content})
 
 
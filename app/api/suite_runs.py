@@ -1,37 +1,47 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+import orjson
+from celery import chain
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
+from pypdf import PdfReader
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
 from app.api.teams import require_role
 from app.core.config import settings
+from app.core.storage import write_case_dirs
+from app.db.crud import suite_run_history_page
 from app.db.models import (
     Scenario,
     SuiteCase,
     SuiteCaseScenario,
     SuiteRun,
     SuiteStatus,
+    TeamMember,
     TeamRole,
     User,
 )
 from app.db.session import get_db
 from app.reporting.suite_pdf_report import generate_suite_report_pdf
+from app.runner.scenario import Scenario as LoadedScenario, load_scenario
 from app.tasks_suite import execute_suite_case, finalize_suite_run
-from app.core.auth_state_store import copy_auth_state_to_dir
+from app.core.auth_state_store import get_auth_state_paths
 
 
 router = APIRouter(prefix="/suite-runs", tags=["suite-runs"])
 
+_MEMBER_ROLES = frozenset({TeamRole.OWNER.value, TeamRole.ADMIN.value, TeamRole.MEMBER.value})
+
 
 class SuiteCreateIn(BaseModel):
     # optional: run under a team (requires ADMIN/OWNER to execute)
@@ -79,31 +89,37 @@ def _require_suite_access(db: Session, *, suite: SuiteRun, user: User) -> None:
 
 
 @router.get("/me")
-def list_my_suite_runs(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def list_my_suite_runs(
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
     """
     ## 내 Suite Run 실행 이력
 
     - **권한**: 로그인 필요
-    - **처리**: requested_by_user_id == me.id 인 suite_runs 목록 반환
+    - **처리**: requested_by_user_id == me.id 인 suite_runs 목록 반환(최신순)
+    - **페이지네이션**: `limit` 기본/최대 200. 다음 페이지가 있으면 `X-Next-Cursor` 헤더 값을 `cursor`로 넘겨 이어서 조회
     """
-    rows = (
-        db.query(SuiteRun)
-        .filter(SuiteRun.requested_by_user_id == user.id, SuiteRun.is_deleted == False)  # noqa: E712
-        .order_by(SuiteRun.created_at.desc())
-        .limit(200)
-        .all()
+    try:
+        rows, next_cursor = suite_run_history_page(db, requested_by_user_id=user.id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return ORJSONResponse(
+        [
+            {
+                "id": r.id,
+                "status": r.status,
+                "team_id": r.team_id,
+                "created_at": r.created_at,
+                "started_at": r.started_at,
+                "finished_at": r.finished_at,
+            }
+            for r in rows
+        ],
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
     )
-    return [
-        {
-            "id": r.id,
-            "status": r.status,
-            "team_id": r.team_id,
-            "created_at": r.created_at.isoformat(),
-            "started_at": r.started_at.isoformat() if r.started_at else None,
-            "finished_at": r.finished_at.isoformat() if r.finished_at else None,
-        }
-        for r in rows
-    ]
 
 
 @router.post("", response_model=SuiteCreated)
@@ -138,27 +154,27 @@ def create_suite_run(
     if not body.combinations:
         raise HTTPException(status_code=400, detail="combinations is empty")
 
-    # Execution permission: team run requires ADMIN/OWNER; personal run always allowed
+    # Resolve every referenced scenario with one IN query (not one db.get per id) and fetch the
+    # caller's roles for the suite team + owning teams at once, then validate before anything is persisted.
+    scenario_ids = {sid for combo in body.combinations for sid in combo}
+    scenarios_by_id = {sc.id: sc for sc in db.query(Scenario).filter(Scenario.id.in_(scenario_ids)).all()}
+    team_ids = {sc.owner_team_id for sc in scenarios_by_id.values() if sc.owner_team_id and sc.owner_user_id != user.id}
     if body.team_id:
-        require_role(db, team_id=body.team_id, user_id=user.id, allow={TeamRole.OWNER.value, TeamRole.ADMIN.value})
-
-    suite_id = str(uuid.uuid4())
-    suite_dir = os.path.join(settings.ARTIFACT_ROOT, "suite", suite_id)
-    Path(suite_dir).mkdir(parents=True, exist_ok=True)
+        team_ids.add(body.team_id)
+    roles_by_team: dict[str, str] = {}
+    if team_ids:
+        roles_by_team = dict(
+            db.query(TeamMember.team_id, TeamMember.role)
+            .filter(TeamMember.user_id == user.id, TeamMember.team_id.in_(team_ids))
+            .all()
+        )
 
-    suite = SuiteRun(
-        id=suite_id,
-        requested_by_user_id=user.id,
-        team_id=body.team_id,
-        status=SuiteStatus.QUEUED.value,
-        artifact_dir=suite_dir,
-        submitted_combinations_json=json.dumps(body.combinations, ensure_ascii=False),
-    )
-    db.add(suite)
-    db.commit()
-    db.refresh(suite)
+    # Execution permission: team run requires ADMIN/OWNER; personal run always allowed
+    # (same check as require_role, against the prefetched roles)
+    if body.team_id and roles_by_team.get(body.team_id) not in (TeamRole.OWNER.value, TeamRole.ADMIN.value):
+        raise HTTPException(status_code=403, detail="insufficient team role")
 
-    case_ids: list[str] = []
+    combo_scenarios: list[list[Scenario]] = []
     for idx, combo in enumerate(body.combinations, start=1):
         if not combo:
             raise HTTPException(status_code=400, detail=f"empty combination at index {idx}")
@@ -166,7 +182,7 @@ def create_suite_run(
         # Validate scenario visibility
         scenarios: list[Scenario] = []
         for sid in combo:
-            sc = db.get(Scenario, sid)
+            sc = scenarios_by_id.get(sid)
             if not sc:
                 raise HTTPException(status_code=404, detail=f"scenario not found: {sid}")
             # personal visibility
@@ -178,44 +194,70 @@ def create_suite_run(
                 # if suite is team-scoped, require same team
                 if body.team_id and sc.owner_team_id != body.team_id:
                     raise HTTPException(status_code=403, detail=f"scenario not in target team: {sid}")
-                # require membership
-                require_role(db, team_id=sc.owner_team_id, user_id=user.id, allow={TeamRole.OWNER.value, TeamRole.ADMIN.value, TeamRole.MEMBER.value})
+                # require membership (OWNER/ADMIN/MEMBER)
+                if roles_by_team.get(sc.owner_team_id) not in _MEMBER_ROLES:
+                    raise HTTPException(status_code=403, detail="insufficient team role")
                 scenarios.append(sc)
                 continue
             raise HTTPException(status_code=403, detail=f"no access to scenario: {sid}")
+        combo_scenarios.append(scenarios)
+
+    # resolve the auth state up front too, so a bad id 404s before anything is persisted
+    auth_state_src = None
+    if body.auth_state_id:
+        try:
+            auth_state_src, _ = get_auth_state_paths(user.id, body.auth_state_id)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="auth state not found")
+
+    suite_id = str(uuid.uuid4())
+    suite_dir = os.path.join(settings.ARTIFACT_ROOT, "suite", suite_id)
+    Path(suite_dir).mkdir(parents=True, exist_ok=True)
+
+    suite = SuiteRun(
+        id=suite_id,
+        requested_by_user_id=user.id,
+        team_id=body.team_id,
+        status=SuiteStatus.QUEUED.value,
+        artifact_dir=suite_dir,
+        submitted_combinations_json=orjson.dumps(body.combinations).decode("utf-8"),
+    )
+    db.add(suite)
+    db.commit()
+    db.refresh(suite)
 
+    case_ids: list[str] = []
+    cases: list[SuiteCase] = []
+    links: list[SuiteCaseScenario] = []
+    # the same scenario is often reused across combinations: load/parse each file once
+    loaded_scenarios: dict[str, LoadedScenario] = {}
+    case_files: list[tuple[str, str, bytes]] = []
+    for idx, scenarios in enumerate(combo_scenarios, start=1):
         case_id = str(uuid.uuid4())
         case_dir = os.path.join(suite_dir, f"case_{idx:03d}_{case_id}")
-        Path(case_dir).mkdir(parents=True, exist_ok=True)
 
         combined_path = os.path.join(case_dir, "combined.json")
         # Combine steps (A안): same browser session = one scenario file with concatenated steps
-        combined = {"base_url": scenarios[0].scenario_path, "steps": []}  # base_url will be overwritten below
-        combined_base_url = None
-        steps: list[dict] = []
+        loaded: list[LoadedScenario] = []
         for sc in scenarios:
-            # load scenario dict from file (json/yaml)
-            from app.runner.scenario import load_scenario
-
-            s = load_scenario(sc.scenario_path)
-            combined_base_url = combined_base_url or s.base_url
-            steps.extend(list(s.steps))
+            # load scenario dict from file (json/yaml); each file once per request
+            s = loaded_scenarios.get(sc.id)
+            if s is None:
+                s = loaded_scenarios[sc.id] = load_scenario(sc.scenario_path)
+            loaded.append(s)
+        # first non-empty base_url wins; steps concatenated in one pass (no per-scenario list copies)
+        combined_base_url = next((s.base_url for s in loaded if s.base_url), None)
+        steps = [step for s in loaded for step in s.steps]
         combined = {"base_url": combined_base_url or "https://example.com", "steps": steps}
 
         # Optional: inject storageState for headless login bypass (Google test account recommended).
+        # The file itself is linked into the case dir by write_case_dirs below.
         if body.auth_state_id:
-            try:
-                copy_auth_state_to_dir(
-                    owner_user_id=user.id,
-                    auth_state_id=body.auth_state_id,
-                    dest_dir=case_dir,
-                    dest_filename="storage_state.json",
-                )
-                combined["requires_auth"] = True
-                combined["storage_state_path"] = "./storage_state.json"
-            except FileNotFoundError:
-                raise HTTPException(status_code=404, detail="auth state not found")
-        Path(combined_path).write_text(json.dumps(combined, ensure_ascii=False, indent=2), encoding="utf-8")
+            combined["requires_auth"] = True
+            combined["storage_state_path"] = "./storage_state.json"
+        case_files.append(
+            (case_dir, combined_path, orjson.dumps(combined, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        )
 
         case = SuiteCase(
             id=case_id,
@@ -225,31 +267,33 @@ def create_suite_run(
             artifact_dir=case_dir,
             combined_scenario_path=combined_path,
         )
-        db.add(case)
-        db.flush()
-
-        for order_i, sc in enumerate(scenarios, start=1):
-            link = SuiteCaseScenario(suite_case_id=case.id, scenario_id=sc.id, order_index=order_i)
-            db.add(link)
-
+        cases.append(case)
+        links.extend(
+            SuiteCaseScenario(suite_case_id=case_id, scenario_id=sc.id, order_index=order_i)
+            for order_i, sc in enumerate(scenarios, start=1)
+        )
         case_ids.append(case_id)
 
+    try:
+        write_case_dirs(case_files, storage_state_src=auth_state_src, storage_state_name="storage_state.json")
+    except FileNotFoundError:
+        # auth state removed after the lookup above
+        raise HTTPException(status_code=404, detail="auth state not found")
+
+    # case ids are assigned up front, so no per-case flush is needed:
+    # one flush emits a batched INSERT per table.
+    db.add_all(cases)
+    db.add_all(links)
     db.commit()
 
     # Queue execution: 순차 실행 (안정화를 위해 병렬 실행 비활성화)
     # 각 케이스를 순차적으로 실행한 후 finalize
-    from celery import chain
-    
-    # 순차 실행 체인 생성
+    # 순차 실행 체인 생성 (`|` 반복 대신 signature 리스트로 한 번에 구성)
     if case_ids:
-        # 첫 번째 케이스부터 시작
-        job_chain = execute_suite_case.s(case_ids[0])
-        # 나머지 케이스들을 체인으로 연결
-        for cid in case_ids[1:]:
-            job_chain = job_chain | execute_suite_case.s(cid)
+        sigs = [execute_suite_case.s(cid) for cid in case_ids]
         # 마지막에 finalize 추가 (chain의 마지막 결과를 무시하고 suite_id만 전달)
-        job_chain = job_chain | finalize_suite_run.si(suite_id)
-        job_chain.apply_async()
+        sigs.append(finalize_suite_run.si(suite_id))
+        chain(*sigs).apply_async()
     else:
         # 케이스가 없으면 바로 finalize
         finalize_suite_run.delay(suite_id)
@@ -271,9 +315,15 @@ def get_suite_run(suite_run_id: str, db: Session = Depends(get_db), user: User =
     if getattr(suite, "is_deleted", False):
         raise HTTPException(status_code=410, detail="suite run deleted")
     _require_suite_access(db, suite=suite, user=user)
-    cases = db.query(SuiteCase).filter(SuiteCase.suite_run_id == suite.id).all()
-    passed = sum(1 for c in cases if c.status == SuiteStatus.PASSED.value)
-    failed = sum(1 for c in cases if c.status == SuiteStatus.FAILED.value)
+    # 케이스 row 전체 대신 상태별 개수만 집계
+    counts = dict(
+        db.query(SuiteCase.status, func.count())
+        .filter(SuiteCase.suite_run_id == suite.id)
+        .group_by(SuiteCase.status)
+        .all()
+    )
+    passed = counts.get(SuiteStatus.PASSED.value, 0)
+    failed = counts.get(SuiteStatus.FAILED.value, 0)
     return SuiteRunOut(
         id=suite.id,
         status=suite.status,
@@ -281,7 +331,7 @@ def get_suite_run(suite_run_id: str, db: Session = Depends(get_db), user: User =
         created_at=suite.created_at.isoformat(),
         started_at=suite.started_at.isoformat() if suite.started_at else None,
         finished_at=suite.finished_at.isoformat() if suite.finished_at else None,
-        case_count=len(cases),
+        case_count=sum(counts.values()),
         passed_cases=passed,
         failed_cases=failed,
     )
@@ -315,6 +365,38 @@ def list_cases(suite_run_id: str, db: Session = Depends(get_db), user: User = De
     ]
 
 
+def _case_dicts(db: Session, suite_run_id: str) -> list[dict[str, Any]]:
+    """리포트에 필요한 컬럼만 case_index 순으로 읽어 dict 리스트로 반환(ORM 객체 생성 없음)"""
+    rows = (
+        db.query(
+            SuiteCase.case_index,
+            SuiteCase.id,
+            SuiteCase.status,
+            SuiteCase.started_at,
+            SuiteCase.finished_at,
+            SuiteCase.error_message,
+            SuiteCase.artifact_dir,
+            SuiteCase.combined_scenario_path,
+        )
+        .filter(SuiteCase.suite_run_id == suite_run_id)
+        .order_by(SuiteCase.case_index.asc())
+        .all()
+    )
+    return [
+        {
+            "case_index": r.case_index,
+            "case_id": r.id,
+            "status": r.status,
+            "started_at": r.started_at,
+            "finished_at": r.finished_at,
+            "error_message": r.error_message,
+            "artifact_dir": r.artifact_dir,
+            "combined_scenario_path": r.combined_scenario_path,
+        }
+        for r in rows
+    ]
+
+
 @router.get("/{suite_run_id}/report.pdf")
 def download_suite_report(suite_run_id: str, refresh: bool = False, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
     """
@@ -333,44 +415,41 @@ def download_suite_report(suite_run_id: str, refresh: bool = False, db: Session
     _require_suite_access(db, suite=suite, user=user)
     pdf_path = Path(suite.artifact_dir) / "suite_report.pdf"
     # Auto-heal: if an existing suite_report is cover-only (<=2 pages), regenerate.
-    if pdf_path.exists() and not refresh:
-        try:
-            from pypdf import PdfReader
-
-            r = PdfReader(str(pdf_path))
-            if len(r.pages) <= 2:
-                refresh = True
-        except Exception:
-            pass
-
-    if refresh or not pdf_path.exists():
-        cases = db.query(SuiteCase).filter(SuiteCase.suite_run_id == suite.id).all()
-        case_dicts = [
-            {
-                "case_index": c.case_index,
-                "case_id": c.id,
-                "status": c.status,
-                "started_at": c.started_at,
-                "finished_at": c.finished_at,
-                "error_message": c.error_message,
-                "artifact_dir": c.artifact_dir,
-                "combined_scenario_path": c.combined_scenario_path,
-            }
-            for c in cases
-        ]
-        generate_suite_report_pdf(
+    # The page count is recorded at generation time; only legacy rows (NULL) parse the PDF, once.
+    try:
+        pdf_stat = pdf_path.stat()
+    except FileNotFoundError:
+        pdf_stat = None
+    if pdf_stat is not None and not refresh:
+        pages = suite.summary_pdf_pages
+        if pages is None:
+            try:
+                pages = len(PdfReader(str(pdf_path)).pages)
+                suite.summary_pdf_pages = pages
+                db.commit()
+            except Exception:
+                pass
+        if pages is not None and pages <= 2:
+            refresh = True
+
+    if refresh or pdf_stat is None:
+        report = generate_suite_report_pdf(
             suite_id=suite.id,
             status=suite.status,
             created_at=suite.created_at,
             started_at=suite.started_at,
             finished_at=suite.finished_at,
             suite_dir=suite.artifact_dir,
-            cases=case_dicts,
+            cases=_case_dicts(db, suite.id),
             output_path=str(pdf_path),
         )
         suite.summary_pdf_path = str(pdf_path)
+        suite.summary_pdf_pages = report.page_count
         db.commit()
-    return FileResponse(path=str(pdf_path), filename="suite_report.pdf")
+        pdf_stat = pdf_path.stat()
+
+    # 이미 구한 stat을 넘겨 FileResponse의 os.stat(스레드 hop 포함)을 생략
+    return FileResponse(path=str(pdf_path), filename="suite_report.pdf", stat_result=pdf_stat)
 
 
 @router.delete(
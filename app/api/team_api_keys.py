@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import secrets
 from datetime import datetime, timezone
-from hashlib import sha256
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -10,7 +9,9 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
+from app.api.public import invalidate_team_api_key_cache
 from app.api.teams import require_role
+from app.core.security import hash_api_key_secret
 from app.db.models import TeamApiKey, TeamRole, User
 from app.db.session import get_db
 
@@ -18,10 +19,6 @@ from app.db.session import get_db
 router = APIRouter(prefix="/teams", tags=["Team Integrations"])
 
 
-def _hash_secret(secret: str) -> str:
-    return sha256(secret.encode("utf-8")).hexdigest()
-
-
 def _make_token(prefix: str, secret: str) -> str:
     return f"dubbi_sk_{prefix}_{secret}"
 
@@ -75,7 +72,7 @@ def create_team_api_key(team_id: str, body: ApiKeyCreateIn, db: Session = Depend
         team_id=team_id,
         name=name,
         prefix=prefix,
-        secret_hash=_hash_secret(secret),
+        secret_hash=hash_api_key_secret(secret),
         created_by_user_id=user.id,
         revoked_at=None,
     )
@@ -103,6 +100,7 @@ def revoke_team_api_key(team_id: str, api_key_id: str, db: Session = Depends(get
         return {"revoked": True, "id": api_key_id, "already": True}
     row.revoked_at = datetime.now(timezone.utc)
     db.commit()
+    invalidate_team_api_key_cache(row.prefix)
     return {"revoked": True, "id": api_key_id}
 
 
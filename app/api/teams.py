@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
+from app.core.storage import ensure_dir, write_file_atomic
+from app.db.crud import suite_run_history_page
 from app.db.models import Team, TeamMember, TeamRole, User, Scenario
 from app.db.session import get_db
 
@@ -62,8 +64,8 @@ def create_team(data: TeamCreateIn, db: Session = Depends(get_db), user: User =
     """
     team = Team(name=data.name)
     db.add(team)
-    db.commit()
-    db.refresh(team)
+    # flush assigns team.id (INSERT only, no commit/refresh): team + OWNER row commit in one transaction
+    db.flush()
 
     # creator becomes OWNER
     m = TeamMember(team_id=team.id, user_id=user.id, role=TeamRole.OWNER.value)
@@ -136,12 +138,19 @@ def list_team_scenarios(team_id: str, db: Session = Depends(get_db), user: User
 
 
 @router.get("/{team_id}/suite-runs")
-def list_team_suite_runs(team_id: str, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def list_team_suite_runs(
+    team_id: str,
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
     """
     ## 팀 Suite Run 실행 이력
 
     - **권한**: 팀 멤버(OWNER/ADMIN/MEMBER)
-    - **처리**: suite_runs.team_id == team_id 인 실행 이력 반환
+    - **처리**: suite_runs.team_id == team_id 인 실행 이력 반환(최신순)
+    - **페이지네이션**: `limit` 기본/최대 200. 다음 페이지가 있으면 `X-Next-Cursor` 헤더 값을 `cursor`로 넘겨 이어서 조회
     """
     require_role(
         db,
@@ -149,25 +158,23 @@ def list_team_suite_runs(team_id: str, db: Session = Depends(get_db), user: User
         user_id=user.id,
         allow={TeamRole.OWNER.value, TeamRole.ADMIN.value, TeamRole.MEMBER.value},
     )
-    from app.db.models import SuiteRun
-
-    rows = (
-        db.query(SuiteRun)
-        .filter(SuiteRun.team_id == team_id, SuiteRun.is_deleted == False)  # noqa: E712
-        .order_by(SuiteRun.created_at.desc())
-        .limit(200)
-        .all()
+    try:
+        rows, next_cursor = suite_run_history_page(db, team_id=team_id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return ORJSONResponse(
+        [
+            {
+                "id": r.id,
+                "status": r.status,
+                "created_at": r.created_at,
+                "started_at": r.started_at,
+                "finished_at": r.finished_at,
+            }
+            for r in rows
+        ],
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
     )
-    return [
-        {
-            "id": r.id,
-            "status": r.status,
-            "created_at": r.created_at.isoformat(),
-            "started_at": r.started_at.isoformat() if r.started_at else None,
-            "finished_at": r.finished_at.isoformat() if r.finished_at else None,
-        }
-        for r in rows
-    ]
 
 
 @router.patch("/{team_id}/scenarios/{scenario_id}")
@@ -216,9 +223,8 @@ async def replace_team_scenario_file(
     content = await scenario.read()
     if not content:
         raise HTTPException(status_code=400, detail="empty scenario file")
-    Path(sc.scenario_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(sc.scenario_path, "wb") as f:
-        f.write(content)
+    ensure_dir(os.path.dirname(sc.scenario_path))
+    write_file_atomic(sc.scenario_path, content)
     db.commit()
     return {"id": sc.id, "scenario_path": sc.scenario_path, "updated_at": sc.updated_at.isoformat()}
 
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-import base64
-import json
+import binascii
 import os
-import shutil
+import tempfile
+import threading
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Any
 
+import orjson
+from cachetools import LRUCache
+
 from app.core.config import settings
+from app.core.storage import ensure_dir, link_or_copy, write_file_bytes
 
 
 @dataclass
@@ -24,17 +27,43 @@ class AuthStateMeta:
     size_bytes: int
 
 
+# Decoded meta files keyed by path, validated against (st_mtime_ns, st_size): meta files are only
+# written on create, so listings and per-request ownership checks re-parse nothing after warmup.
+_META_CACHE: LRUCache = LRUCache(maxsize=2048)
+_meta_cache_lock = threading.Lock()
+
+
+def _load_meta(path: str, st: os.stat_result | None = None) -> dict[str, Any]:
+    """Parsed meta JSON for ``path`` (treat as read-only). Pass ``st`` when a stat is already at hand."""
+    if st is None:
+        st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _meta_cache_lock:
+        hit = _META_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    with open(path, "rb") as f:
+        d = orjson.loads(f.read())
+    with _meta_cache_lock:
+        _META_CACHE[path] = (key, d)
+    return d
+
+
+# settings are frozen, so the root prefix is built once; ids are single path components (uuid4)
+_ROOT_PREFIX = settings.AUTH_STATE_ROOT + os.sep
+
+
 def _user_dir(user_id: str) -> str:
-    return os.path.join(settings.AUTH_STATE_ROOT, user_id)
+    return f"{_ROOT_PREFIX}{user_id}"
 
 
 def _paths(user_id: str, auth_state_id: str) -> tuple[str, str]:
-    base = os.path.join(_user_dir(user_id), auth_state_id)
+    base = f"{_ROOT_PREFIX}{user_id}{os.sep}{auth_state_id}"
     return base + ".json", base + ".meta.json"
 
 
 def ensure_dirs(user_id: str) -> None:
-    Path(_user_dir(user_id)).mkdir(parents=True, exist_ok=True)
+    ensure_dir(_user_dir(user_id))
 
 
 def validate_storage_state_dict(d: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -43,43 +72,79 @@ def validate_storage_state_dict(d: dict[str, Any]) -> tuple[bool, list[str]]:
     Expected shape:
       { "cookies": [...], "origins": [ { "origin": "...", "localStorage": [...] } ] }
     """
-    errors: list[str] = []
-    if not isinstance(d, dict):
+    if type(d) is not dict:
         return False, ["storageState must be an object"]
-    if "cookies" not in d or not isinstance(d.get("cookies"), list):
-        errors.append("missing or invalid 'cookies' (must be array)")
-    if "origins" not in d or not isinstance(d.get("origins"), list):
-        errors.append("missing or invalid 'origins' (must be array)")
+    errors: list[str] = []
+    add = errors.append
+    cookies = d.get("cookies")
+    origins = d.get("origins")
+    # parsed JSON only ever yields exact list/dict, so `type(x) is` is enough (no isinstance MRO walk)
+    if type(cookies) is not list:
+        add("missing or invalid 'cookies' (must be array)")
+    if type(origins) is not list:
+        add("missing or invalid 'origins' (must be array)")
+        origins = ()
     # optional deeper checks
-    origins = d.get("origins") if isinstance(d.get("origins"), list) else []
     for i, o in enumerate(origins[:20]):
-        if not isinstance(o, dict):
-            errors.append(f"origins[{i}] must be object")
+        if type(o) is not dict:
+            add(f"origins[{i}] must be object")
             continue
         if "origin" not in o:
-            errors.append(f"origins[{i}] missing 'origin'")
-        if "localStorage" in o and not isinstance(o.get("localStorage"), list):
-            errors.append(f"origins[{i}].localStorage must be array")
+            add(f"origins[{i}] missing 'origin'")
+        if "localStorage" in o and type(o["localStorage"]) is not list:
+            add(f"origins[{i}].localStorage must be array")
     return (len(errors) == 0), errors
 
 
-def save_auth_state(*, owner_user_id: str, name: str, provider: str, raw_json_bytes: bytes) -> AuthStateMeta:
+def new_upload_tempfile(owner_user_id: str):
+    """
+    Temp file inside the user's store dir, so a finished upload can be moved into place with
+    ``save_auth_state(src_path=...)`` (same filesystem -> atomic rename). Caller removes it on failure.
+    """
+    ensure_dirs(owner_user_id)
+    return tempfile.NamedTemporaryFile(dir=_user_dir(owner_user_id), prefix=".upload-", suffix=".tmp", delete=False)
+
+
+def save_auth_state(
+    *,
+    owner_user_id: str,
+    name: str,
+    provider: str,
+    raw_json_bytes: bytes | None = None,
+    src_path: str | None = None,
+) -> AuthStateMeta:
+    """
+    Store a storageState JSON given either in memory (``raw_json_bytes``) or as an already
+    written file (``src_path``, e.g. from ``new_upload_tempfile``) which is renamed into place.
+    """
+    if (raw_json_bytes is None) == (src_path is None):
+        raise TypeError("exactly one of raw_json_bytes / src_path is required")
     ensure_dirs(owner_user_id)
     auth_state_id = str(uuid.uuid4())
     data_path, meta_path = _paths(owner_user_id, auth_state_id)
 
     # validate JSON
     try:
-        d = json.loads(raw_json_bytes.decode("utf-8"))
+        if src_path is not None:
+            with open(src_path, "rb") as f:
+                d = orjson.loads(f.read())
+        else:
+            d = orjson.loads(raw_json_bytes)
     except Exception as e:
         raise ValueError(f"storageState JSON 파싱 실패: {e}")
 
     ok, errors = validate_storage_state_dict(d)
     if not ok:
         raise ValueError("storageState 형식 오류:\n" + "\n".join(f"- {e}" for e in errors))
+    del d
 
     now = datetime.now(timezone.utc).isoformat()
-    Path(data_path).write_bytes(raw_json_bytes)
+    if src_path is not None:
+        size_bytes = os.path.getsize(src_path)
+        os.replace(src_path, data_path)
+    else:
+        size_bytes = len(raw_json_bytes)
+        write_file_bytes(data_path, raw_json_bytes)
     meta = AuthStateMeta(
         id=auth_state_id,
         owner_user_id=owner_user_id,
@@ -87,62 +152,104 @@ def save_auth_state(*, owner_user_id: str, name: str, provider: str, raw_json_by
         provider=provider.strip() or "unknown",
         created_at=now,
         updated_at=now,
-        size_bytes=len(raw_json_bytes),
+        size_bytes=size_bytes,
     )
-    Path(meta_path).write_text(json.dumps(meta.__dict__, ensure_ascii=False, indent=2), encoding="utf-8")
+    # meta is written last: listings and lookups key off the meta file, so its presence implies the data file
+    write_file_bytes(meta_path, orjson.dumps(meta.__dict__, option=orjson.OPT_INDENT_2))
     return meta
 
 
 def list_auth_states(owner_user_id: str) -> list[AuthStateMeta]:
-    ensure_dirs(owner_user_id)
+    # single scandir pass: mtime comes from the dirent stat, no separate glob + stat per file.
+    # The directory is already per-user, so meta files are not re-checked for ownership here.
+    try:
+        with os.scandir(_user_dir(owner_user_id)) as it:
+            entries = [
+                (e.path, e.stat(follow_symlinks=False))
+                for e in it
+                if e.name.endswith(".meta.json") and e.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda x: x[1].st_mtime, reverse=True)
+
     rows: list[AuthStateMeta] = []
-    for p in sorted(Path(_user_dir(owner_user_id)).glob("*.meta.json"), key=lambda x: x.stat().st_mtime, reverse=True):
+    for path, st in entries:
         try:
-            d = json.loads(p.read_text(encoding="utf-8"))
-            if d.get("owner_user_id") != owner_user_id:
-                continue
-            rows.append(AuthStateMeta(**d))
+            rows.append(AuthStateMeta(**_load_meta(path, st)))
         except Exception:
             continue
     return rows
 
 
+def _check_id(auth_state_id: str) -> None:
+    # ids come from URLs/request bodies: reject anything that is not a single path component
+    if not auth_state_id or "/" in auth_state_id or os.sep in auth_state_id or auth_state_id.startswith("."):
+        raise FileNotFoundError("auth state not found")
+
+
 def get_auth_state_paths(owner_user_id: str, auth_state_id: str) -> tuple[str, str]:
+    _check_id(auth_state_id)
     data_path, meta_path = _paths(owner_user_id, auth_state_id)
-    if not os.path.exists(data_path) or not os.path.exists(meta_path):
+    if not os.path.exists(data_path):
         raise FileNotFoundError("auth state not found")
     # verify ownership from meta file
-    meta = json.loads(Path(meta_path).read_text(encoding="utf-8"))
+    try:
+        meta = _load_meta(meta_path)
+    except FileNotFoundError:
+        raise FileNotFoundError("auth state not found") from None
     if meta.get("owner_user_id") != owner_user_id:
         raise FileNotFoundError("auth state not found")
     return data_path, meta_path
 
 
 def delete_auth_state(owner_user_id: str, auth_state_id: str) -> None:
-    data_path, meta_path = get_auth_state_paths(owner_user_id, auth_state_id)
+    """
+    Remove an auth state: two unlinks, no exists/read round-trip first.
+
+    The per-user directory already scopes ownership, so the meta file is not parsed. It is
+    unlinked first (a missing meta file means "not found"), which also drops the entry from
+    listings before the data file goes.
+    """
+    _check_id(auth_state_id)
+    data_path, meta_path = _paths(owner_user_id, auth_state_id)
     try:
-        os.remove(data_path)
-    except Exception:
-        pass
+        os.unlink(meta_path)
+    except FileNotFoundError:
+        raise FileNotFoundError("auth state not found") from None
     try:
-        os.remove(meta_path)
-    except Exception:
+        os.unlink(data_path)
+    except FileNotFoundError:
         pass
+    with _meta_cache_lock:
+        _META_CACHE.pop(meta_path, None)
 
 
-def storage_state_b64(owner_user_id: str, auth_state_id: str) -> str:
+def storage_state_b64(owner_user_id: str, auth_state_id: str) -> bytes:
+    """
+    Base64 (ASCII bytes, no newline) of the stored storageState JSON.
+
+    The file is read straight into a buffer sized from fstat and encoded once; the result stays
+    bytes so callers can put it into a response body without another full-size str copy.
+    """
     data_path, _ = get_auth_state_paths(owner_user_id, auth_state_id)
-    return base64.b64encode(Path(data_path).read_bytes()).decode("utf-8")
+    with open(data_path, "rb", buffering=0) as f:
+        buf = bytearray(os.fstat(f.fileno()).st_size)
+        n = f.readinto(buf)
+    return binascii.b2a_base64(memoryview(buf)[:n], newline=False)
 
 
 def copy_auth_state_to_dir(*, owner_user_id: str, auth_state_id: str, dest_dir: str, dest_filename: str) -> str:
     """
     Copy stored auth state JSON into dest_dir and return absolute dest path.
+
+    Hard-links when possible (stored data files are written once under a fresh id and never
+    modified in place, and the runner only reads the copy); falls back to a sendfile copy
+    across filesystems.
     """
     src_path, _ = get_auth_state_paths(owner_user_id, auth_state_id)
-    Path(dest_dir).mkdir(parents=True, exist_ok=True)
+    os.makedirs(dest_dir, exist_ok=True)
     dst = os.path.join(dest_dir, dest_filename)
-    shutil.copyfile(src_path, dst)
-    return dst
+    return link_or_copy(src_path, dst)
 
 
@@ -7,9 +7,22 @@ scenarios. The Celery broker and backend are configured via
 environment variables defined in ``app/core/config.py``.
 """
 
+import orjson
 from celery import Celery
+from kombu.serialization import register
+
 from app.core.config import settings
 
+# Task/result payloads are plain JSON data (ids, small result dicts, chain
+# signatures); encode them with orjson instead of kombu's stdlib-json serializer.
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary",
+)
+
 # Create the Celery application. Both the broker and the result backend
 # point at the same Redis instance. In a production deployment you might
 # use separate Redis databases or even different backends entirely.
@@ -25,6 +38,25 @@ celery_app = Celery(
 celery_app.conf.update(
     task_track_started=True,
     task_time_limit=60 * 30,  # 30 minutes upper bound per task
+    # Scenario runs are long and heavy: reserve one task per worker process at a time.
+    # Acks stay early by default: scenario/suite tasks write case dirs and flip statuses,
+    # so they must not be re-run after a worker crash. Only tasks that opt in per task
+    # (acks_late=True, e.g. send_suite_webhook) are redelivered.
+    worker_prefetch_multiplier=1,
+    # Unacked (acks_late) messages are redelivered after this; keep it above task_time_limit
+    # so a task that is still running is never handed to a second worker.
+    broker_transport_options={"visibility_timeout": 60 * 60},
+    # Webhook delivery is I/O-bound: its own queue, consumed by a thread-pool
+    # worker (see docker-compose ``webhook-worker``) instead of the prefork one.
+    task_routes={"send_suite_webhook": {"queue": "webhook"}},
+    # Rolling deploy: this build accepts both encodings but still produces json by default.
+    # Flip CELERY_SERIALIZER=orjson once no older worker/API process is left, since those
+    # reject application/x-orjson with ContentDisallowed. "json" stays accepted so messages
+    # queued before the switch still decode.
+    task_serializer=settings.CELERY_SERIALIZER,
+    result_serializer=settings.CELERY_SERIALIZER,
+    accept_content=["orjson", "json"],
+    result_accept_content=["orjson", "json"],
 )
 
 __all__ = ["celery_app"]
\ No newline at end of file
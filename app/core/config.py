@@ -23,10 +23,21 @@ class Settings(BaseSettings):
     URLs.
     """
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    # Read once at import and never mutated: frozen so module-level values derived from it
+    # (JWT signing state, API key hasher, store paths) cannot drift from the live settings.
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
     DATABASE_URL: str = "postgresql+psycopg://postgres:postgres@db:5432/e2e"
     REDIS_URL: str = "redis://redis:6379/0"
+    # Celery task/result serializer ("json" | "orjson"). Every process accepts both; switch to
+    # "orjson" only after all API/worker processes run a build that accepts it.
+    CELERY_SERIALIZER: str = "json"
+
+    # SQLAlchemy QueuePool sizing, per process (each uvicorn worker / Celery process has its own pool).
+    # Keep (DB_POOL_SIZE + DB_MAX_OVERFLOW) * processes <= Postgres max_connections.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 10  # seconds to wait for a free connection before erroring
 
     ARTIFACT_ROOT: str = "./artifacts"
     BASE_URL_ALLOWLIST: str = ""  # optional allowlist of base URLs (comma separated)
@@ -36,6 +47,13 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
 
+    # Team API key secret hashing key (keyed BLAKE2b, max 64 bytes used).
+    # Changing the effective key invalidates every issued API key; they must all be reissued.
+    # WARNING: when unset, the key is derived from JWT_SECRET_KEY, so rotating the JWT signing
+    # secret then also invalidates every team API key (a warning is logged at API startup).
+    # Set this explicitly in production to decouple the two.
+    API_KEY_PEPPER: str = ""  # override in env for production
+
     # Scenario storage root (separate from artifacts; default under ARTIFACT_ROOT for docker volume)
     SCENARIO_ROOT: str = "./scenario_store"
 
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from typing import Any
 
+import orjson
+import yaml
+
+# libyaml (C) safe loader/dumper when available; same semantics as safe_load/safe_dump
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def inject_storage_state_path_into_scenario_file(*, scenario_path: str, storage_state_rel_path: str) -> None:
     """
@@ -13,13 +19,10 @@ def inject_storage_state_path_into_scenario_file(*, scenario_path: str, storage_
       - storage_state_path: <rel path>
     """
     ext = os.path.splitext(scenario_path)[1].lower()
-    raw = Path(scenario_path).read_text(encoding="utf-8")
     if ext == ".json":
-        d = json.loads(raw)
+        d = orjson.loads(Path(scenario_path).read_bytes())
     else:
-        import yaml
-
-        d = yaml.safe_load(raw)
+        d = yaml.load(Path(scenario_path).read_text(encoding="utf-8"), Loader=_YAML_LOADER)
     if not isinstance(d, dict):
         d = {"steps": []}
     d["requires_auth"] = True
@@ -32,10 +35,10 @@ def inject_storage_state_path_into_scenario_file(*, scenario_path: str, storage_
         d["_meta"] = {"auth_note": "storageState injected by server (auth_state_id)"}
 
     if ext == ".json":
-        Path(scenario_path).write_text(json.dumps(d, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        Path(scenario_path).write_bytes(orjson.dumps(d, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n")
     else:
-        import yaml
-
-        Path(scenario_path).write_text(yaml.safe_dump(d, allow_unicode=True, sort_keys=False), encoding="utf-8")
+        Path(scenario_path).write_text(
+            yaml.dump(d, Dumper=_YAML_DUMPER, allow_unicode=True, sort_keys=False), encoding="utf-8"
+        )
 
 
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from hmac import compare_digest
 
+import orjson
 from jose import jwt
 from passlib.context import CryptContext
 
@@ -14,8 +21,18 @@ from app.core.config import settings
 # passlib의 bcrypt_sha256(사전 SHA-256 후 bcrypt 적용)로 전환합니다.
 #
 # 이미 생성된 계정이 bcrypt 해시를 가지고 있을 수 있으므로,
-# verify 호환을 위해 bcrypt도 함께 허용합니다(신규 hash는 bcrypt_sha256 사용).
-pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+# verify 호환을 위해 bcrypt도 함께 허용합니다.
+#
+# 신규 hash는 Argon2id(길이 제한 없음, memory-hard)를 사용하고,
+# bcrypt_sha256/bcrypt 해시는 로그인 성공 시 Argon2id로 재해시합니다(verify_and_update_password).
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=65536,  # KiB (64 MiB)
+    argon2__time_cost=3,
+    argon2__parallelism=4,
+)
 
 
 def hash_password(password: str) -> str:
@@ -26,14 +43,102 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """
+    Verify and, when the stored hash uses a deprecated scheme/params, return a replacement hash.
+    """
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+# 비밀번호 해시 전용 풀: argon2-cffi/bcrypt는 GIL을 해제하므로 스레드로도 코어 수만큼 병렬 처리됩니다.
+# 기본 executor와 분리해 로그인 폭주가 다른 to_thread 작업을 밀어내지 않게 하고,
+# 동시 해시 수를 제한해 Argon2id(64 MiB/건) 메모리 사용량 상한을 둡니다.
+_PASSWORD_POOL = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2), thread_name_prefix="pwhash")
+
+
+# 호출 측(sync 라우트)은 FastAPI 스레드풀에서 DB 작업과 함께 실행되고, 해시 계산만 이 풀에서 기다립니다.
+def hash_password_pooled(password: str) -> str:
+    return _PASSWORD_POOL.submit(hash_password, password).result()
+
+
+def verify_and_update_password_pooled(password: str, password_hash: str) -> tuple[bool, str | None]:
+    return _PASSWORD_POOL.submit(verify_and_update_password, password, password_hash).result()
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS* 토큰은 header와 키가 고정이므로 import 시 한 번만 준비합니다.
+# (header b64 + 키가 적용된 HMAC 객체를 만들어 두고 발급 시 copy()만 → 매번 키 패딩/알고리즘 파싱 생략)
+# 그 외 알고리즘은 python-jose로 발급합니다. 검증은 항상 python-jose.
+_JWT_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_JWT_DIGEST = _JWT_HMAC_DIGESTS.get(settings.JWT_ALGORITHM)
+_JWT_HMAC = hmac.new(settings.JWT_SECRET_KEY.encode("utf-8"), digestmod=_JWT_DIGEST) if _JWT_DIGEST else None
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": settings.JWT_ALGORITHM, "typ": "JWT"}))
+
+
 def create_access_token(*, subject: str, expires_minutes: int | None = None) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": subject, "iat": int(now.timestamp()), "exp": exp}
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    iat = int(now.timestamp())
+    if _JWT_HMAC is None:
+        payload = {"sub": subject, "iat": iat, "exp": exp}
+        return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    claims = orjson.dumps({"sub": subject, "iat": iat, "exp": int(exp.timestamp())})
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(claims)
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
 
 
 def decode_access_token(token: str) -> dict:
     return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
 
 
+# Team API key secrets are random tokens (not user passwords), so a fast keyed hash is enough.
+# BLAKE2b supports keying natively (no separate HMAC wrapper) and is faster than SHA-256 in CPython.
+# The key is API_KEY_PEPPER, or, when that is unset, a subkey derived from JWT_SECRET_KEY, so the
+# hash is never unkeyed. Changing the effective key makes every stored hash unverifiable: all
+# issued API keys must then be reissued.
+# True when API_KEY_PEPPER is unset and the key is derived (app.main logs a warning at startup).
+API_KEY_PEPPER_DERIVED = not settings.API_KEY_PEPPER
+_API_KEY_PEPPER = (
+    settings.API_KEY_PEPPER.encode("utf-8")
+    or hmac.new(settings.JWT_SECRET_KEY.encode("utf-8"), b"team-api-key-pepper", hashlib.sha256).digest()
+)[:64]
+# Stored hashes carry a scheme prefix so verification can dispatch on it (one hash per request)
+# and the scheme can be rolled again later. Unprefixed rows are legacy and get rewritten on use.
+_API_KEY_HASH_PREFIX = "b2$"
+
+
+# keyed state prepared once; each hash copies it instead of re-running the key block
+_API_KEY_HASHER = hashlib.blake2b(digest_size=32, key=_API_KEY_PEPPER)
+
+
+def _blake2b_hex(secret: str) -> str:
+    h = _API_KEY_HASHER.copy()
+    h.update(secret.encode("utf-8"))
+    return h.hexdigest()
+
+
+def hash_api_key_secret(secret: str) -> str:
+    # Hashes the secret text exactly as issued/submitted (token_urlsafe): hashing the raw token
+    # bytes instead would need a base64 decode on every verification, and a BYTEA column migration.
+    return _API_KEY_HASH_PREFIX + _blake2b_hex(secret)
+
+
+def verify_and_update_api_key_secret(secret: str, secret_hash: str) -> tuple[bool, str | None]:
+    """
+    Verify an API key secret against its stored hash.
+
+    Returns ``(valid, new_hash)`` like passlib's ``verify_and_update``: ``new_hash`` is set when the
+    row still holds a legacy unprefixed sha256 hex digest and should be rewritten with the current scheme.
+    """
+    if secret_hash.startswith(_API_KEY_HASH_PREFIX):
+        return compare_digest(secret_hash, hash_api_key_secret(secret)), None
+    # Legacy rows: the keyed BLAKE2b scheme replaced unkeyed sha256 because sha256 had no key, not
+    # for speed; hashlib.sha256 is OpenSSL-backed and already uses SHA-NI where the CPU has it.
+    if compare_digest(secret_hash, hashlib.sha256(secret.encode("utf-8")).hexdigest()):
+        return True, hash_api_key_secret(secret)
+    return False, None
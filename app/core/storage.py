@@ -7,15 +7,42 @@ substitute a remote store (e.g. S3 or Google Cloud Storage) in a
 future iteration without changing the rest of the codebase.
 """
 
+import errno
 import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 from app.core.config import settings
 
 
+def ensure_dir(path: str) -> str:
+    """
+    Create ``path`` (and parents) if missing.
+
+    Deliberately not memoized: directories can be removed or moved away
+    while the service runs (suite-run deletion, pending-delete moves), and
+    ``os.makedirs(exist_ok=True)`` on an existing directory is already cheap.
+
+    :return: The directory path
+    """
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+_ARTIFACT_PREFIX = settings.ARTIFACT_ROOT + os.sep
+
+
 def get_run_dir(run_id: str) -> str:
     """Return the absolute path to the directory used for a given run."""
-    return os.path.join(settings.ARTIFACT_ROOT, run_id)
+    return f"{_ARTIFACT_PREFIX}{run_id}"
 
 
 def list_artifacts(run_id: str) -> List[str]:
@@ -25,12 +52,178 @@ def list_artifacts(run_id: str) -> List[str]:
     :param run_id: Identifier of the run whose artifacts to list
     :return: A list of filenames contained in the run directory
     """
-    run_dir = get_run_dir(run_id)
-    if not os.path.isdir(run_dir):
+    # one scandir pass: is_file() comes from the dirent type, no per-entry stat
+    try:
+        with os.scandir(get_run_dir(run_id)) as it:
+            return [e.name for e in it if e.is_file(follow_symlinks=False)]
+    except (FileNotFoundError, NotADirectoryError):
         return []
-    return [f for f in os.listdir(run_dir) if os.path.isfile(os.path.join(run_dir, f))]
 
 
 def artifact_path(run_id: str, filename: str) -> str:
     """Construct an absolute path to a specific artifact file."""
     return os.path.join(get_run_dir(run_id), filename)
+
+
+# ioctl FICLONE (linux/fs.h): reflink on copy-on-write filesystems (Btrfs/XFS)
+_FICLONE = 0x40049409
+
+
+# os.link errors that mean "no hard link possible here", not "something is wrong":
+# cross-device, filesystem without hard links / not permitted, too many links.
+_LINK_UNSUPPORTED = frozenset({errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP})
+
+
+def _clone_or_copy(src: str, dst: str) -> None:
+    """
+    Reflink ``src`` to a new file ``dst`` where supported, else a kernel-side (sendfile) copy.
+
+    ``dst`` must not exist: it is created with ``O_EXCL`` and never truncated in place, so an
+    existing file (possibly another link to ``src``) is left alone. Removed again on failure.
+    """
+    dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        try:
+            if fcntl is not None:
+                src_fd = os.open(src, os.O_RDONLY)
+                try:
+                    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                    return
+                except OSError:
+                    pass
+                finally:
+                    os.close(src_fd)
+        finally:
+            os.close(dst_fd)
+        shutil.copyfile(src, dst)
+    except BaseException:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+
+
+def _place_new(src: str, dst: str) -> None:
+    """Hard-link ``src`` to the not-yet-existing ``dst``, falling back to a reflink/copy."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _LINK_UNSUPPORTED:
+            raise
+        _clone_or_copy(src, dst)
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    Place ``src`` at ``dst`` without copying bytes when possible.
+
+    A hard link is used when both paths live on the same filesystem; the
+    runner only reads these files, so sharing the inode is safe. If linking
+    is not supported, try a reflink (FICLONE) and finally ``shutil.copyfile``,
+    which uses ``sendfile`` on Linux.
+
+    An existing ``dst`` is replaced atomically (placed under a temp name in
+    the same directory, then ``os.replace``'d). It is never opened for
+    writing: it may be a hard link to ``src`` itself.
+
+    :return: The destination path
+    """
+    try:
+        _place_new(src, dst)
+        return dst
+    except FileExistsError:
+        pass
+    tmp = os.path.join(os.path.dirname(dst) or ".", f".link-{uuid.uuid4().hex}.tmp")
+    _place_new(src, tmp)
+    try:
+        # if dst is already a link to the same inode, rename() is a no-op and tmp stays behind
+        os.replace(tmp, dst)
+    finally:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+    return dst
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def write_file_bytes(path: str, data: bytes) -> None:
+    """
+    Write an already-encoded payload to ``path`` (created or truncated).
+
+    Goes straight to ``os.write`` on a raw fd: the payload is fully buffered
+    in memory already, so the ``io`` buffering layer would only add a copy.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """
+    Replace ``path`` with ``data`` so readers see either the old or the new file.
+
+    The payload goes to a unique temp file in the same directory, is fsync'ed,
+    then ``os.replace``'d over the target (atomic on POSIX). Use this when
+    overwriting a file that may be read concurrently; brand-new paths can use
+    :func:`write_file_bytes`.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".write-", suffix=".tmp")
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            _write_all(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+_CASE_WRITE_WORKERS = 8
+
+
+def _write_case_dir(
+    case_dir: str, combined_path: str, combined_bytes: bytes, storage_state_src: str | None, storage_state_name: str
+) -> None:
+    os.makedirs(case_dir, exist_ok=True)
+    if storage_state_src:
+        # each case dir gets its own entry for execution isolation (hard link: the runner only reads it)
+        link_or_copy(storage_state_src, os.path.join(case_dir, storage_state_name))
+    write_file_bytes(combined_path, combined_bytes)
+
+
+def write_case_dirs(
+    case_files: List[tuple],
+    *,
+    storage_state_src: str | None = None,
+    storage_state_name: str | None = None,
+) -> None:
+    """
+    Create suite case directories and their files, several at once.
+
+    ``case_files`` holds ``(case_dir, combined_path, combined_bytes)`` rows.
+    Each case dir is created, ``storage_state_src`` (if given) is placed in
+    it as ``storage_state_name`` (default: the source basename), and the
+    combined scenario is written. Case dirs are independent, so the work runs
+    on a small thread pool to overlap filesystem latency. The first error is
+    re-raised.
+    """
+    if not case_files:
+        return
+    name = storage_state_name or (os.path.basename(storage_state_src) if storage_state_src else "")
+    with ThreadPoolExecutor(max_workers=min(_CASE_WRITE_WORKERS, len(case_files))) as pool:
+        list(pool.map(lambda f: _write_case_dir(*f, storage_state_src, name), case_files))
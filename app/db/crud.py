@@ -1,5 +1,5 @@
 """
-Run CRUD helpers.
+Run CRUD helpers (+ suite run history paging).
 
 MVP 목표:
 - Run 메타/상태/시간은 DB가 source of truth
@@ -8,11 +8,14 @@ MVP 목표:
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import and_, or_, update
 from sqlalchemy.orm import Session
 
-from app.db.models import Run, RunStatus
+from app.db.models import Run, RunStatus, SuiteCase, SuiteRun
 
 
 def create_run(
@@ -40,11 +43,12 @@ def get_run(db: Session, run_id: str) -> Run | None:
 
 
 def mark_running(db: Session, run_id: str) -> None:
-    run = db.get(Run, run_id)
-    if not run:
-        return
-    run.status = RunStatus.RUNNING.value
-    run.started_at = datetime.now(timezone.utc)
+    # 상태 전이는 SELECT 없이 UPDATE ... WHERE id 한 번으로 (없는 run이면 0 rows, no-op)
+    db.execute(
+        update(Run)
+        .where(Run.id == run_id)
+        .values(status=RunStatus.RUNNING.value, started_at=datetime.now(timezone.utc))
+    )
     db.commit()
 
 
@@ -55,11 +59,107 @@ def mark_finished(
     exit_code: int | None,
     error_message: str | None = None,
 ) -> None:
-    run = db.get(Run, run_id)
-    if not run:
+    db.execute(
+        update(Run)
+        .where(Run.id == run_id)
+        .values(
+            status=RunStatus.PASSED.value if passed else RunStatus.FAILED.value,
+            exit_code=exit_code,
+            error_message=error_message,
+            finished_at=datetime.now(timezone.utc),
+        )
+    )
+    db.commit()
+
+
+def bulk_mark_suite_cases(
+    db: Session,
+    rows: list[tuple[str, str, datetime | None, int | None]],
+) -> None:
+    """
+    SuiteCase 상태를 한 번에 기록: rows = [(case_id, status, finished_at, exit_code), ...]
+
+    여러 case를 한꺼번에 정리(reconcile)할 때용: SELECT 없이 PK 기준 ORM bulk UPDATE(executemany) 한 번 + 커밋 한 번.
+    PK bulk UPDATE는 identity map을 동기화하지 않으므로, 이미 로드한 case 하나를 갱신할 때는
+    속성을 직접 바꾸고 커밋하세요(execute_suite_case처럼).
+    """
+    if not rows:
         return
-    run.status = RunStatus.PASSED.value if passed else RunStatus.FAILED.value
-    run.exit_code = exit_code
-    run.error_message = error_message
-    run.finished_at = datetime.now(timezone.utc)
+    db.execute(
+        update(SuiteCase),
+        [
+            {"id": case_id, "status": status, "finished_at": finished_at, "exit_code": exit_code}
+            for case_id, status, finished_at, exit_code in rows
+        ],
+    )
     db.commit()
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_history_cursor(created_at: datetime, row_id: str) -> str:
+    """(created_at, id) -> URL-safe opaque cursor (base64url of `{epoch_us}:{id}`, padding 제거)"""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    epoch_us = (created_at - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{epoch_us}:{row_id}".encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_history_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    encode_history_cursor의 역변환.
+
+    :raises ValueError: cursor 형식이 잘못된 경우
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("invalid cursor") from None
+    epoch_us_s, sep, row_id = raw.partition(":")
+    if not sep or not row_id:
+        raise ValueError("invalid cursor")
+    try:
+        return _EPOCH + timedelta(microseconds=int(epoch_us_s)), row_id
+    except OverflowError:
+        raise ValueError("invalid cursor") from None
+
+
+def suite_run_history_page(
+    db: Session,
+    *,
+    requested_by_user_id: str | None = None,
+    team_id: str | None = None,
+    cursor: str | None = None,
+    limit: int = 200,
+) -> tuple[list[SuiteRun], str | None]:
+    """
+    최신순 suite run 이력 한 페이지(keyset pagination).
+
+    - 정렬 키는 (created_at, id) desc: created_at이 같은 row도 페이지 경계에서 빠지거나 중복되지 않음
+    - cursor는 이전 페이지가 돌려준 next_cursor(encode_history_cursor, URL-safe라 그대로 query에 넣어도 됨), 없으면 첫 페이지
+    - OFFSET 없이 인덱스 범위 스캔으로 이어 읽으므로 이력이 길어도 페이지 비용이 일정
+    - limit+1 건을 읽어 다음 페이지 존재 여부를 COUNT 없이 판단
+
+    :raises ValueError: cursor 형식이 잘못된 경우
+    :return: (rows, next_cursor) - 마지막 페이지면 next_cursor는 None
+    """
+    q = db.query(SuiteRun).filter(SuiteRun.is_deleted == False)  # noqa: E712
+    if requested_by_user_id is not None:
+        q = q.filter(SuiteRun.requested_by_user_id == requested_by_user_id)
+    if team_id is not None:
+        q = q.filter(SuiteRun.team_id == team_id)
+    if cursor:
+        created_at, last_id = decode_history_cursor(cursor)
+        q = q.filter(
+            or_(
+                SuiteRun.created_at < created_at,
+                and_(SuiteRun.created_at == created_at, SuiteRun.id < last_id),
+            )
+        )
+    rows = q.order_by(SuiteRun.created_at.desc(), SuiteRun.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_history_cursor(last.created_at, last.id)
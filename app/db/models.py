@@ -10,7 +10,7 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -30,6 +30,8 @@ class RunStatus(str, enum.Enum):
 
 class Run(Base):
     __tablename__ = "runs"
+    # "내 run 목록"(owner_user_id == me ORDER BY created_at DESC LIMIT N): 정렬된 인덱스 스캔으로 LIMIT에서 멈춤
+    __table_args__ = (Index("ix_runs_owner_created", "owner_user_id", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)  # UUID string
     status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
@@ -136,6 +138,11 @@ class SuiteStatus(str, enum.Enum):
 
 class SuiteRun(Base):
     __tablename__ = "suite_runs"
+    # "내 이력"/"팀 이력" keyset 목록(삭제 제외, created_at·id desc) 전용 부분 인덱스
+    __table_args__ = (
+        Index("ix_suite_runs_user_created", "requested_by_user_id", "created_at", "id", postgresql_where=text("NOT is_deleted")),
+        Index("ix_suite_runs_team_created", "team_id", "created_at", "id", postgresql_where=text("NOT is_deleted")),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     requested_by_user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -149,6 +156,9 @@ class SuiteRun(Base):
 
     artifact_dir: Mapped[str] = mapped_column(Text, nullable=False)
     summary_pdf_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # page count recorded when suite_report.pdf is generated (cover-only check without parsing the PDF)
+    summary_pdf_pages: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # write-only audit copy of the request (orjson-encoded text); nothing parses it back, so it stays TEXT
     submitted_combinations_json: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # --- External trigger (CI/CD) ---
@@ -178,6 +188,8 @@ class CombinationDraft(Base):
     """
 
     __tablename__ = "combination_drafts"
+    # list_drafts: WHERE owner_user_id = ? ORDER BY updated_at DESC LIMIT 200
+    __table_args__ = (Index("ix_draft_owner_updated", "owner_user_id", "updated_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     owner_user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -190,6 +202,7 @@ class CombinationDraft(Base):
 
 class SuiteCase(Base):
     __tablename__ = "suite_cases"
+    __table_args__ = (Index("ix_suite_cases_run_case_idx", "suite_run_id", "case_index"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     suite_run_id: Mapped[str] = mapped_column(String(36), ForeignKey("suite_runs.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -235,7 +248,7 @@ class TeamApiKey(Base):
 
     # Token format: dubbi_sk_<prefix>_<secret>
     prefix: Mapped[str] = mapped_column(String(32), nullable=False, unique=True, index=True)
-    secret_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # sha256 hex
+    secret_hash: Mapped[str] = mapped_column(String(128), nullable=False)  # "b2$" + keyed blake2b hex (legacy rows: unprefixed hex)
 
     created_by_user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -252,6 +265,8 @@ class TeamApiKey(Base):
 
 class ExternalSuiteRequestLog(Base):
     __tablename__ = "external_suite_request_logs"
+    # integration logs: WHERE team_id = ? ORDER BY created_at DESC LIMIT 200
+    __table_args__ = (Index("ix_ext_req_log_team_created", "team_id", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     team_id: Mapped[str] = mapped_column(String(36), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -270,6 +285,7 @@ class ExternalSuiteRequestLog(Base):
 
 class WebhookDeliveryLog(Base):
     __tablename__ = "webhook_delivery_logs"
+    __table_args__ = (Index("ix_webhook_log_team_created", "team_id", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     team_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("teams.id", ondelete="SET NULL"), nullable=True, index=True)
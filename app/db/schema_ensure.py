@@ -6,47 +6,213 @@ Lightweight schema auto-migration for MVP.
 We don't use Alembic yet. `create_all()` creates tables but does NOT add columns.
 This module ensures a small set of additive columns at startup using Postgres'
 `ALTER TABLE ... ADD COLUMN IF NOT EXISTS` (best-effort).
+
+Once the schema (model tables + these statements) has applied cleanly, its version
+(a digest of the DDL) is recorded in `schema_migrations` and later startups skip
+both `create_all()` and the DDL entirely.
 """
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+import hashlib
 
+from sqlalchemy import MetaData, TextClause, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
 
-def ensure_schema(engine: Engine) -> None:
-    # Only attempt on Postgres (our docker compose default). Best-effort.
-    if engine.dialect.name not in ("postgresql", "postgres"):
-        return
 
+# Additive columns per table. Each table's clauses are sent as ONE `ALTER TABLE` statement
+# (Postgres accepts a comma-separated list of ADD COLUMN actions), so startup costs one
+# round-trip per table instead of one per column.
+_ADD_COLUMNS: dict[str, list[str]] = {
+    # runs: ownership + soft-delete fields (additive)
+    "runs": [
+        "owner_user_id VARCHAR(36)",
+        "is_deleted BOOLEAN NOT NULL DEFAULT FALSE",
+        "deleted_at TIMESTAMPTZ",
+        "deleted_artifact_dir TEXT",
+    ],
+    "suite_runs": [
+        # preserve submitted combinations / soft delete / report page count (additive)
+        "submitted_combinations_json TEXT",
+        "is_deleted BOOLEAN NOT NULL DEFAULT FALSE",
+        "deleted_at TIMESTAMPTZ",
+        "deleted_artifact_dir TEXT",
+        "summary_pdf_pages INTEGER",
+        # external trigger + webhook (additive)
+        "trigger_api_key_id VARCHAR(36)",
+        "external_idempotency_key VARCHAR(200)",
+        "external_context_json TEXT",
+        "webhook_url TEXT",
+        "webhook_secret TEXT",
+        "webhook_attempts INTEGER NOT NULL DEFAULT 0",
+        "webhook_last_status_code INTEGER",
+        "webhook_last_error TEXT",
+        "webhook_delivered_at TIMESTAMPTZ",
+    ],
+}
+
+_OTHER_DDL: list[str] = [
+    # team_api_keys: room for the hash scheme prefix (varchar widening is catalog-only, no rewrite;
+    # guarded so startup doesn't take an ACCESS EXCLUSIVE lock once it's done)
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'team_api_keys' AND column_name = 'secret_hash' AND character_maximum_length < 128
+        ) THEN
+            ALTER TABLE team_api_keys ALTER COLUMN secret_hash TYPE VARCHAR(128);
+        END IF;
+    END $$
+    """,
+]
+
+# composite indexes for "latest N" list queries (create_all skips existing tables).
+# Building one on a large existing table can take a while, so these run without statement_timeout.
+_INDEX_DDL: list[str] = [
+    'CREATE INDEX IF NOT EXISTS ix_draft_owner_updated ON combination_drafts (owner_user_id, updated_at)',
+    'CREATE INDEX IF NOT EXISTS ix_ext_req_log_team_created ON external_suite_request_logs (team_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_webhook_log_team_created ON webhook_delivery_logs (team_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_suite_runs_user_created ON suite_runs (requested_by_user_id, created_at, id) WHERE NOT is_deleted',
+    'CREATE INDEX IF NOT EXISTS ix_suite_runs_team_created ON suite_runs (team_id, created_at, id) WHERE NOT is_deleted',
+    'CREATE INDEX IF NOT EXISTS ix_suite_cases_run_case_idx ON suite_cases (suite_run_id, case_index)',
+    'CREATE INDEX IF NOT EXISTS ix_runs_owner_created ON runs (owner_user_id, created_at)',
+]
+
+
+# Bounds for the DDL transaction: ALTER TABLE needs an ACCESS EXCLUSIVE lock, and waiting
+# behind a long query/backup/another worker would hang startup. Fail fast instead; the
+# caller's backoff loop (app.main) retries the whole (idempotent) transaction.
+# statement_timeout bounds create_all (new, empty tables) and the ALTERs; index builds are exempt.
+_LOCK_TIMEOUT = "3s"
+_STATEMENT_TIMEOUT = "30s"
+_PG_LOCK_NOT_AVAILABLE = "55P03"
+
+
+# Advisory lock key (signed bigint) serializing ensure_schema across workers/replicas.
+_SCHEMA_LOCK_KEY = int.from_bytes(
+    hashlib.blake2b(b"e2e_schema_ensure_v1", digest_size=8).digest(), "big", signed=True
+)
+
+
+def _is_lock_timeout(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "pgcode", None) == _PG_LOCK_NOT_AVAILABLE
+
+
+def _statements() -> list[str]:
     stmts = [
-        # runs: ownership + soft-delete fields (additive)
-        'ALTER TABLE IF EXISTS runs ADD COLUMN IF NOT EXISTS owner_user_id VARCHAR(36)',
-        'ALTER TABLE IF EXISTS runs ADD COLUMN IF NOT EXISTS is_deleted BOOLEAN NOT NULL DEFAULT FALSE',
-        'ALTER TABLE IF EXISTS runs ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ',
-        'ALTER TABLE IF EXISTS runs ADD COLUMN IF NOT EXISTS deleted_artifact_dir TEXT',
-        # suite_runs: preserve submitted combinations (additive)
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS submitted_combinations_json TEXT',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS is_deleted BOOLEAN NOT NULL DEFAULT FALSE',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS deleted_artifact_dir TEXT',
-
-        # suite_runs: external trigger + webhook (additive)
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS trigger_api_key_id VARCHAR(36)',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS external_idempotency_key VARCHAR(200)',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS external_context_json TEXT',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_url TEXT',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_secret TEXT',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_attempts INTEGER NOT NULL DEFAULT 0',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_last_status_code INTEGER',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_last_error TEXT',
-        'ALTER TABLE IF EXISTS suite_runs ADD COLUMN IF NOT EXISTS webhook_delivered_at TIMESTAMPTZ',
+        f"ALTER TABLE IF EXISTS {table} " + ", ".join(f"ADD COLUMN IF NOT EXISTS {col}" for col in cols)
+        for table, cols in _ADD_COLUMNS.items()
     ]
+    return stmts + _OTHER_DDL
 
-    with engine.begin() as conn:
-        for sql in stmts:
-            try:
-                conn.execute(text(sql))
-            except Exception:
-                # best-effort: don't block startup in MVP
-                continue
 
+# Built once at import: the raw SQL feeds the version digest, the TextClauses are executed
+# (no re-parsing of the strings for bind params on each startup/retry).
+_ALTER_SQL: tuple[str, ...] = tuple(_statements())
+_SQL: tuple[str, ...] = _ALTER_SQL + tuple(_INDEX_DDL)
+_STMTS: tuple[TextClause, ...] = tuple(text(sql) for sql in _ALTER_SQL)
+_INDEX_STMTS: tuple[TextClause, ...] = tuple(text(sql) for sql in _INDEX_DDL)
+
+_SET_LOCK_TIMEOUT = text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'")
+_SET_STATEMENT_TIMEOUT = text(f"SET LOCAL statement_timeout = '{_STATEMENT_TIMEOUT}'")
+_CLEAR_STATEMENT_TIMEOUT = text("SET LOCAL statement_timeout = 0")
+_TRY_LOCK = text("SELECT pg_try_advisory_xact_lock(:k)")
+_LOCK = text("SELECT pg_advisory_xact_lock(:k)")
+_CREATE_MARKER_TABLE = text(
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    "version VARCHAR(64) PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+)
+_SELECT_MARKER = text("SELECT 1 FROM schema_migrations WHERE version = :v")
+# inside the DDL transaction an error would abort it, so probe the marker table first
+_SELECT_MARKER_IN_TX = text(
+    "SELECT to_regclass('schema_migrations') IS NOT NULL "
+    "AND EXISTS (SELECT 1 FROM schema_migrations WHERE version = :v)"
+)
+_INSERT_MARKER = text("INSERT INTO schema_migrations (version) VALUES (:v) ON CONFLICT DO NOTHING")
+
+
+def _schema_version(engine: Engine, metadata: MetaData | None, stmts: tuple[str, ...]) -> str:
+    # Derived from the DDL itself (model tables/indexes as compiled for this dialect + the
+    # additive statements above), so changing either is what "bumps" the version.
+    parts: list[str] = []
+    if metadata is not None:
+        for table in metadata.sorted_tables:
+            parts.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+            for ix in sorted(table.indexes, key=lambda x: x.name or ""):
+                parts.append(str(CreateIndex(ix).compile(dialect=engine.dialect)))
+    parts.extend(stmts)
+    return hashlib.blake2b("\n;\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _already_applied(engine: Engine, version: str) -> bool:
+    # one round-trip in the steady state; a missing marker table just means "not yet"
+    with engine.connect() as conn:
+        try:
+            row = conn.execute(_SELECT_MARKER, {"v": version}).first()
+        except ProgrammingError:
+            return False
+    return row is not None
+
+
+def _apply_best_effort(conn: Connection, stmt: TextClause) -> bool:
+    # SAVEPOINT per statement, see ensure_schema
+    try:
+        with conn.begin_nested():
+            conn.execute(stmt)
+    except Exception as e:
+        if isinstance(e, DBAPIError) and _is_lock_timeout(e):
+            # table is busy: roll back and let the caller retry with backoff
+            raise
+        # best-effort: don't block startup in MVP
+        return False
+    return True
+
+
+def ensure_schema(engine: Engine, metadata: MetaData | None = None) -> None:
+    """
+    Create missing tables (``metadata.create_all``) and apply the additive DDL above.
+
+    On Postgres both are skipped when ``schema_migrations`` already records the current
+    version, so a steady-state startup is a single SELECT (no per-table catalog checks).
+    The DDL runs under a short lock timeout (and, except for index builds, a statement
+    timeout); a lock timeout is re-raised (as a ``DBAPIError``) so the caller can retry
+    instead of blocking startup on a busy table.
+    A transaction-scoped advisory lock lets only one worker apply it at a time.
+    """
+    # Only attempt the additive DDL on Postgres (our docker compose default). Best-effort.
+    if engine.dialect.name not in ("postgresql", "postgres"):
+        if metadata is not None:
+            metadata.create_all(bind=engine)
+        return
+
+    version = _schema_version(engine, metadata, _SQL)
+    if _already_applied(engine, version):
+        return
+
+    with engine.begin() as conn:
+        # SET LOCAL: scoped to this transaction, the pooled connection keeps its defaults
+        conn.execute(_SET_LOCK_TIMEOUT)
+        conn.execute(_SET_STATEMENT_TIMEOUT)
+        # Only one worker runs the DDL. The xact-scoped lock is released on commit/rollback.
+        # Others wait (bounded by lock_timeout -> caller retries) and then find the marker set.
+        if not conn.execute(_TRY_LOCK, {"k": _SCHEMA_LOCK_KEY}).scalar():
+            conn.execute(_LOCK, {"k": _SCHEMA_LOCK_KEY})
+            if conn.execute(_SELECT_MARKER_IN_TX, {"v": version}).scalar():
+                return
+        if metadata is not None:
+            metadata.create_all(bind=conn)
+        conn.execute(_CREATE_MARKER_TABLE)
 
+        # Each best-effort statement runs under its own SAVEPOINT: on Postgres an error aborts the
+        # enclosing transaction, which would fail every later statement and turn the final COMMIT
+        # into a ROLLBACK (also undoing create_all above).
+        failed = False
+        for stmt in _STMTS:
+            failed |= not _apply_best_effort(conn, stmt)
+        conn.execute(_CLEAR_STATEMENT_TIMEOUT)
+        for stmt in _INDEX_STMTS:
+            failed |= not _apply_best_effort(conn, stmt)
+        # Only mark the version when everything applied; otherwise retry on next startup.
+        if not failed:
+            conn.execute(_INSERT_MARKER, {"v": version})
@@ -4,17 +4,82 @@ Database session management.
 This module defines a SQLAlchemy engine and session factory for interacting with
 the database. It also provides a declarative Base and a FastAPI dependency that
 yields a session and ensures it is closed after use.
+
+The engine is created lazily on first use (``get_engine()``), so importing the app
+does not load the DB driver or parse the DSN; nothing here connects at import time.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import threading
+import time
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
 
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# Connections older than this are replaced on checkout (keep below the server/proxy idle timeout).
+_POOL_RECYCLE_SECONDS = 1800
+# Only connections that sat idle in the pool longer than this are pinged before use.
+_PING_IF_IDLE_SECONDS = 60
+
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
+
+
+def _stamp_checkin(dbapi_conn, conn_record) -> None:
+    conn_record.info["last_checkin"] = time.monotonic()
+
+
+def _ping_if_idle(dbapi_conn, conn_record, conn_proxy) -> None:
+    last = conn_record.info.get("last_checkin")
+    if last is None or time.monotonic() - last <= _PING_IF_IDLE_SECONDS:
+        return
+    try:
+        alive = get_engine().dialect.do_ping(dbapi_conn)
+    except Exception as e:
+        # the pool discards this connection and retries checkout with a fresh one
+        raise DisconnectionError() from e
+    if not alive:
+        raise DisconnectionError()
+
+
+def _create_engine() -> Engine:
+    pool_kwargs = (
+        {}
+        if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"  # local/dev only, default pool
+        else {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        }
+    )
+    # No pool_pre_ping: that costs a `SELECT 1` round-trip on every checkout (= every request).
+    # Recently used connections are trusted; long-idle ones are pinged by the checkout hook.
+    eng = create_engine(settings.DATABASE_URL, pool_recycle=_POOL_RECYCLE_SECONDS, **pool_kwargs)
+    event.listen(eng, "checkin", _stamp_checkin)
+    event.listen(eng, "checkout", _ping_if_idle)
+    return eng
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+    return _engine
+
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def SessionLocal() -> Session:  # noqa: N802 - kept callable like the former sessionmaker
+    """New ORM session bound to the (lazily created) engine."""
+    return _session_factory(bind=get_engine())
 
 
 class Base(DeclarativeBase):
@@ -6,10 +6,14 @@ submit new test runs. The actual business logic lives in other
 modules under the app package (for example, ``app/api/routes_runs.py``).
 """
 
-import time
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.routes_runs import router as runs_router
 from app.api.auth import router as auth_router
 from app.api.scenarios import router as scenarios_router
@@ -21,14 +25,81 @@ from app.api.public import router as public_router
 from app.api.team_api_keys import router as team_api_keys_router
 from app.api.integration_logs import router as integration_logs_router
 from app.api.auth_states import router as auth_states_router
-from app.core.config import settings
-from app.db.session import Base, engine
+from app.core.security import API_KEY_PEPPER_DERIVED
+from app.db.session import Base, get_engine
 from app.db.schema_ensure import ensure_schema
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError
 
-# Create FastAPI app instance and include the runs router.
-app = FastAPI(title="E2E Service")
-origins = [o.strip() for o in settings.CORS_ORIGINS.split(",") if o.strip()]
+# 스키마 준비(create_all + ensure_schema) 완료 여부. /readyz가 이 값을 보고 트래픽 수신 가능 여부를 알립니다.
+schema_ready = asyncio.Event()
+# 재시도를 모두 소진했거나 재시도 불가 오류로 스키마 준비를 포기한 경우 True. /readyz, /healthz 모두 503을 반환합니다.
+schema_failed = False
+_schema_task: asyncio.Task | None = None
+_SCHEMA_ATTEMPTS = 8
+
+logger = logging.getLogger(__name__)
+
+
+def _create_schema() -> None:
+    # Ensure models are registered before creating tables.
+    # (import side-effect registers `Run` on `Base.metadata`).
+    from app.db import models  # noqa: F401
+
+    # create_all + additive schema updates for existing DBs (no Alembic in MVP);
+    # skipped as a whole once the current schema version is recorded.
+    ensure_schema(get_engine(), Base.metadata)
+
+
+async def _ensure_schema_bg() -> None:
+    # Docker compose/k8s 환경에서 DB가 아직 ready가 아닐 수 있어 재시도합니다.
+    # 지수 백오프(1, 2, 4, ... 최대 30초) + jitter(x0.5~1.5)로 여러 워커가 동시에 DB에 몰리지 않게 분산합니다(총 ~2분).
+    # 블로킹 DDL은 스레드에서 실행해 이벤트 루프/헬스 체크를 막지 않습니다.
+    for attempt in range(_SCHEMA_ATTEMPTS):
+        try:
+            await asyncio.to_thread(_create_schema)
+            schema_ready.set()
+            return
+        except DBAPIError:
+            # 드라이버별로 기동 경합이 OperationalError 외의 DBAPIError로도 올라옵니다.
+            if attempt == _SCHEMA_ATTEMPTS - 1:
+                logger.exception("schema ensure failed: attempt=%d (giving up)", attempt + 1)
+                break
+            delay = min(30, 2**attempt) * random.uniform(0.5, 1.5)
+            logger.exception("schema ensure failed, retrying: attempt=%d delay=%.1fs", attempt + 1, delay)
+            await asyncio.sleep(delay)
+        except Exception:
+            # import/컴파일 오류 등 재시도로 해결되지 않는 오류
+            logger.exception("schema ensure failed: attempt=%d (not retryable)", attempt + 1)
+            break
+    # 프로세스를 직접 죽이지 않습니다(멀티 워커에서는 워커 하나만 죽고 supervisor가 재기동 루프에 빠짐).
+    # 실패 상태로 두고 /healthz(liveness)를 실패시켜 오케스트레이터가 프로세스를 재시작하게 합니다.
+    global schema_failed
+    schema_failed = True
+    logger.critical("schema is not ready; /readyz and /healthz now report failure")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if API_KEY_PEPPER_DERIVED:
+        logger.warning(
+            "API_KEY_PEPPER is not set: team API key hashes are keyed from JWT_SECRET_KEY, "
+            "so rotating JWT_SECRET_KEY will invalidate every team API key"
+        )
+    # 스키마 작업은 백그라운드로: 앱은 바로 요청을 받고, 준비 완료는 /readyz로 확인
+    global _schema_task
+    _schema_task = asyncio.create_task(_ensure_schema_bg())
+    try:
+        yield
+    finally:
+        # 종료 시 아직 재시도 중인 스키마 작업은 취소(대기 중인 sleep/스레드 결과를 기다리지 않음)
+        if not _schema_task.done():
+            _schema_task.cancel()
+
+
+# Create FastAPI app instance and include the API routers.
+# 응답 직렬화는 stdlib json 대신 orjson으로 (라우트가 직접 Response를 반환하면 그대로 사용).
+# orjson은 datetime을 isoformat()과 같은 RFC 3339 문자열로 인코딩하므로, 라우트는 datetime을 그대로 넣어도 됩니다.
+app = FastAPI(title="E2E Service", default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     # Recorder extension(content/background)의 Origin은 chrome-extension://... 또는 경우에 따라 null로 들어올 수 있습니다.
@@ -38,7 +109,10 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 이력 목록 keyset 페이지네이션 커서(브라우저에서 읽을 수 있도록 노출)
+    expose_headers=["X-Next-Cursor"],
 )
+
 app.include_router(runs_router, prefix="/runs", tags=["runs"])
 app.include_router(auth_router)
 app.include_router(auth_states_router)
@@ -52,22 +126,16 @@ app.include_router(team_api_keys_router)
 app.include_router(integration_logs_router)
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    # Ensure models are registered before creating tables.
-    # (import side-effect registers `Run` on `Base.metadata`).
-    from app.db import models  # noqa: F401
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    if not schema_ready.is_set():
+        return ORJSONResponse({"ready": False, "schema_failed": schema_failed}, status_code=503)
+    return {"ready": True}
 
-    # Docker compose 환경에서 DB가 아직 ready가 아닐 수 있어, 간단히 재시도합니다.
-    last_exc: Exception | None = None
-    for _ in range(10):
-        try:
-            Base.metadata.create_all(bind=engine)
-            # Additive schema updates for existing DBs (no Alembic in MVP)
-            ensure_schema(engine)
-            return
-        except OperationalError as e:
-            last_exc = e
-            time.sleep(1)
-    if last_exc:
-        raise last_exc
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    # liveness: 스키마 준비 중에는 살아 있음, 준비를 포기한 뒤에만 실패
+    if schema_failed:
+        return ORJSONResponse({"alive": False}, status_code=503)
+    return {"alive": True}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -594,21 +595,21 @@ def generate_run_report_pdf(
     try:
         story.append(Paragraph("아티팩트 목록", styles["Heading2"]))
         items: list[list[Any]] = [["파일명", "크기(bytes)", "미리보기"]]
-        for f in sorted(run_dir.iterdir()):
-            if not f.is_file():
-                continue
-
+        with os.scandir(run_dir) as it:
+            # DirEntry.is_file()은 d_type을 사용하므로 파일당 stat은 크기 조회 1회뿐
+            entries = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+        for e in entries:
             preview: Any = ""
-            if _is_image_path(f):
+            if _is_image_path(Path(e.name)):
                 try:
-                    img = Image(str(f))
+                    img = Image(e.path)
                     # 표 안에서 한눈에 보이도록 작은 썸네일로 제한
                     img._restrictSize(3.2 * cm, 3.2 * cm)
                     preview = img
                 except Exception:
                     preview = ""
 
-            items.append([f.name, str(f.stat().st_size), preview])
+            items.append([e.name, str(e.stat().st_size), preview])
 
         t = Table(items, colWidths=[8.5 * cm, 3.0 * cm, 5.0 * cm], repeatRows=1)
         t.setStyle(
@@ -3,9 +3,10 @@ from __future__ import annotations
 import json
 import os
 import traceback
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -25,6 +26,13 @@ from app.reporting.pdf_report import (
 from app.reporting.pdf_report import generate_run_report_pdf
 
 
+@dataclass(frozen=True)
+class SuiteReport:
+    path: str
+    # pages actually written (cover + merged case reports); None if unknown
+    page_count: int | None
+
+
 def _thumb(path: Path, w_cm: float = 2.6, h_cm: float = 2.6) -> Image:
     img = Image(str(path))
     img._restrictSize(w_cm * cm, h_cm * cm)
@@ -105,16 +113,21 @@ def generate_suite_report_pdf(
     started_at: datetime | None,
     finished_at: datetime | None,
     suite_dir: str,
-    cases: list[dict],
+    cases: Iterable[dict],
     output_path: str,
-) -> str:
+) -> SuiteReport:
     """
     Generate a suite-level PDF report that summarizes all cases and embeds thumbnails.
 
-    `cases` expects dicts containing:
+    `cases` is an iterable of dicts, already in case_index order (callers query them ordered), containing:
       - case_index (int), case_id (str), status (str), started_at/finished_at (datetime|None),
         artifact_dir (str), combined_scenario_path (str)
+    It is materialized once; the cover, failure-detail and per-case report passes all reuse that list.
+
+    The returned page count lets callers persist it (SuiteRun.summary_pdf_pages) instead of
+    re-parsing the PDF later.
     """
+    cases = list(cases)
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
@@ -160,7 +173,7 @@ def generate_suite_report_pdf(
     header = ["#", "상태", "소요", "실패 step", "미리보기(FAIL/home/step_*)"]
     rows: list[list[Any]] = [header]
 
-    for c in sorted(cases, key=lambda x: x["case_index"]):
+    for c in cases:
         case_dir = Path(c["artifact_dir"])
         stdout = (case_dir / "pytest.stdout.log").read_text(encoding="utf-8", errors="replace") if (case_dir / "pytest.stdout.log").exists() else ""
         allure_dir = case_dir / "allure-results"
@@ -249,7 +262,7 @@ def generate_suite_report_pdf(
     story.append(Spacer(1, 0.5 * cm))
 
     # Optional per-case failure detail (highlight)
-    for c in sorted(cases, key=lambda x: x["case_index"]):
+    for c in cases:
         if c["status"] != "FAILED":
             continue
         case_dir = Path(c["artifact_dir"])
@@ -319,7 +332,7 @@ def generate_suite_report_pdf(
 
     # 2) Per-case detailed reports (reuse the existing run report generator)
     case_report_paths: list[Path] = []
-    for c in sorted(cases, key=lambda x: x["case_index"]):
+    for c in cases:
         case_dir = Path(c["artifact_dir"])
         case_pdf = case_dir / "report.pdf"
         # Prefer existing report.pdf produced during execution (fast + avoids re-generation failures)
@@ -355,6 +368,7 @@ def generate_suite_report_pdf(
 
     # 3) Merge cover + case reports into suite_report.pdf
     # Use PdfWriter(add_page) instead of PdfMerger for maximum robustness.
+    page_count: int | None = None
     try:
         from pypdf import PdfReader, PdfWriter
 
@@ -367,6 +381,7 @@ def generate_suite_report_pdf(
                 writer.add_page(pg)
         with open(out, "wb") as f:
             writer.write(f)
+        page_count = len(writer.pages)
     except Exception as e:
         # Keep cover-only report, but write debug info next to it.
         try:
@@ -379,9 +394,10 @@ def generate_suite_report_pdf(
         try:
             # Keep cover as the output if merge failed.
             cover_path.replace(out)
+            page_count = cover_doc.page
         except Exception:
             pass
 
-    return str(out)
+    return SuiteReport(path=str(out), page_count=page_count)
 
 
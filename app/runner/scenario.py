@@ -10,8 +10,9 @@ action.
 
 from dataclasses import dataclass
 from typing import Any, Dict, List
-import json
 import os
+
+import orjson
 import yaml
 
 @dataclass
@@ -29,7 +30,7 @@ def load_scenario(path: str) -> Scenario:
     ext = os.path.splitext(path)[1].lower()
 
     if ext == ".json":
-        data = json.loads(content)
+        data = orjson.loads(content)
     else:
         # 기본은 yaml/yml로 처리
         data = yaml.safe_load(content)
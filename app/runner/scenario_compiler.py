@@ -46,11 +46,12 @@ def _generate_selector_candidates(step: Dict[str, Any]) -> List[str]:
     
     # 2순위: id/class 기반 (짧고 고정적인 것)
     if selector:
+        single_token = len(selector.split()) == 1
         # id 기반이면 우선순위 높임
-        if selector.startswith("#") and len(selector.split()) == 1:
+        if selector.startswith("#") and single_token:
             candidates.append(selector)
         # class 기반이면 (짧은 경우만)
-        elif selector.startswith(".") and len(selector.split()) == 1:
+        elif selector.startswith(".") and single_token:
             candidates.append(selector)
         # data-* 속성 기반
         elif selector.startswith("[data-"):
@@ -65,15 +66,8 @@ def _generate_selector_candidates(step: Dict[str, Any]) -> List[str]:
             # 원본 selector는 최후에
             candidates.append(selector)
     
-    # 중복 제거 (순서 유지)
-    seen = set()
-    unique_candidates = []
-    for c in candidates:
-        if c not in seen:
-            seen.add(c)
-            unique_candidates.append(c)
-    
-    return unique_candidates
+    # 중복 제거 (순서 유지): dict는 삽입 순서를 보존
+    return list(dict.fromkeys(candidates))
 
 
 def _infer_wait_steps(
@@ -200,6 +194,10 @@ def _infer_success_conditions(
     return conditions
 
 
+# compile 시 raw step에서 그대로 복사하는 기본 필드
+_COPY_KEYS = ("type", "url", "value", "delay_ms", "delay", "frame", "popup_url")
+
+
 def compile_scenario(raw_scenario: Dict[str, Any]) -> Dict[str, Any]:
     """
     Raw Scenario를 Executable Scenario로 컴파일
@@ -220,12 +218,8 @@ def compile_scenario(raw_scenario: Dict[str, Any]) -> Dict[str, Any]:
     
     for i, raw_step in enumerate(raw_steps):
         step_type = raw_step.get("type")
-        compiled_step: Dict[str, Any] = {}
-        
         # 기본 필드 복사
-        for key in ["type", "url", "value", "delay_ms", "delay", "frame", "popup_url"]:
-            if key in raw_step:
-                compiled_step[key] = raw_step[key]
+        compiled_step: Dict[str, Any] = {key: raw_step[key] for key in _COPY_KEYS if key in raw_step}
         
         # Step 타입별 보강
         if step_type == "click":
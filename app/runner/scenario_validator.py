@@ -13,6 +13,17 @@ class ScenarioValidationError(Exception):
     pass
 
 
+# 검증 규칙 상수는 호출마다 만들지 않도록 모듈 로드 시 한 번만 생성
+_URL_SCHEMES = ("http://", "https://")
+
+# runner 내부적으로 처리되어 별도 필드 검증이 필요 없는 step 타입
+_PASSTHROUGH_STEP_TYPES = frozenset({"click_popup", "popup_go", "close_page", "switch_main"})
+
+_SUPPORTED_STEP_TYPES_MSG = (
+    "지원되는 타입: go, click, fill, expect_text, expect_visible, expect_url, wait_visible, wait_url, screenshot"
+)
+
+
 def validate_scenario(scenario: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
     시나리오를 검증하고 문제점 목록을 반환합니다.
@@ -35,7 +46,7 @@ def validate_scenario(scenario: Dict[str, Any]) -> Tuple[bool, List[str]]:
     if base_url:
         if not isinstance(base_url, str):
             errors.append("base_url은 문자열이어야 합니다.")
-        elif not (base_url.startswith("http://") or base_url.startswith("https://")):
+        elif not base_url.startswith(_URL_SCHEMES):
             errors.append("base_url은 http:// 또는 https://로 시작해야 합니다.")
     
     # 3. steps 검증 (필수)
@@ -179,12 +190,12 @@ def validate_step(step: Dict[str, Any], step_index: int) -> List[str]:
         # name은 선택적
         pass
     
-    elif step_type in ("click_popup", "popup_go", "close_page", "switch_main"):
+    elif step_type in _PASSTHROUGH_STEP_TYPES:
         # 이 타입들은 특별한 검증 필요 없음 (내부적으로 처리)
         pass
     
     else:
-        errors.append(f"Step {step_index}: 알 수 없는 step 타입 '{step_type}'입니다. 지원되는 타입: go, click, fill, expect_text, expect_visible, expect_url, wait_visible, wait_url, screenshot")
+        errors.append(f"Step {step_index}: 알 수 없는 step 타입 '{step_type}'입니다. {_SUPPORTED_STEP_TYPES_MSG}")
     
     # 공통 필드 검증
     delay_ms = step.get("delay_ms")
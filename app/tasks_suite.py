@@ -5,6 +5,7 @@ import subprocess
 import traceback
 from datetime import datetime, timezone
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.core.celery_app import celery_app
@@ -22,14 +23,15 @@ def execute_suite_case(case_id: str) -> dict:
         if not case:
             return {"case_id": case_id, "error": "case not found"}
 
-        suite = db.get(SuiteRun, case.suite_run_id)
-        if suite and suite.started_at is None:
-            suite.started_at = datetime.now(timezone.utc)
-            suite.status = SuiteStatus.RUNNING.value
-            db.commit()
-
+        # suite 시작 표시(첫 case만 해당, 조건부 UPDATE) + case RUNNING 전환을 한 번의 커밋으로
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(SuiteRun)
+            .where(SuiteRun.id == case.suite_run_id, SuiteRun.started_at.is_(None))
+            .values(started_at=now, status=SuiteStatus.RUNNING.value)
+        )
         case.status = SuiteStatus.RUNNING.value
-        case.started_at = datetime.now(timezone.utc)
+        case.started_at = now
         db.commit()
 
         run_dir = case.artifact_dir
@@ -85,7 +87,7 @@ def finalize_suite_run(suite_run_id: str, results: list[dict] | None = None) ->
         if not suite:
             return {"suite_run_id": suite_run_id, "error": "suite not found"}
 
-        cases = db.query(SuiteCase).filter(SuiteCase.suite_run_id == suite.id).all()
+        cases = db.query(SuiteCase).filter(SuiteCase.suite_run_id == suite.id).order_by(SuiteCase.case_index.asc()).all()
         if suite.started_at is None:
             suite.started_at = min((c.started_at for c in cases if c.started_at), default=datetime.now(timezone.utc))
 
@@ -113,7 +115,7 @@ def finalize_suite_run(suite_run_id: str, results: list[dict] | None = None) ->
                 for c in cases
             ]
             try:
-                generate_suite_report_pdf(
+                report = generate_suite_report_pdf(
                     suite_id=suite.id,
                     status=suite.status,
                     created_at=suite.created_at,
@@ -124,6 +126,7 @@ def finalize_suite_run(suite_run_id: str, results: list[dict] | None = None) ->
                     output_path=pdf_path,
                 )
                 suite.summary_pdf_path = pdf_path
+                suite.summary_pdf_pages = report.page_count
             except Exception:
                 # report generation should not break finalize
                 pass
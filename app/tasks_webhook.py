@@ -21,7 +21,16 @@ def _sign(secret: str, ts: int, body: bytes) -> str:
     return mac.hexdigest()
 
 
-@celery_app.task(bind=True, name="send_suite_webhook", max_retries=5, default_retry_delay=10)
+# Redelivered if the worker dies mid-delivery: a repeated POST is acceptable for webhooks
+# (receivers may see the same delivery twice), a lost one is not.
+@celery_app.task(
+    bind=True,
+    name="send_suite_webhook",
+    max_retries=5,
+    default_retry_delay=10,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
 def send_suite_webhook(self, suite_run_id: str) -> dict:
     db: Session = SessionLocal()
     try:
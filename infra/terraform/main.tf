@@ -131,10 +131,12 @@ resource "aws_lb_target_group" "api" {
   target_type = "ip"
   tags        = local.tags
 
+  # /readyz answers 200 only once the startup schema work has finished (503 before, and after
+  # it has given up), so traffic never reaches a task whose database is not migrated yet.
   health_check {
-    path                = "/"
+    path                = "/readyz"
     protocol            = "HTTP"
-    matcher             = "200-499"
+    matcher             = "200"
     interval            = 30
     healthy_threshold   = 2
     unhealthy_threshold = 3
@@ -335,6 +337,20 @@ resource "aws_ecs_task_definition" "api" {
         { name = "AUTH_STATE_ROOT", value = local.auth_state_root },
         { name = "PUBLIC_BASE_URL", value = var.public_base_url != "" ? var.public_base_url : "http://${aws_lb.api.dns_name}" },
       ]
+      # Liveness: /healthz turns 503 once the schema work has given up, and ECS then replaces
+      # the task. The image has no curl, so the probe uses the bundled python.
+      healthCheck = {
+        command = [
+          "CMD",
+          "python",
+          "-c",
+          "import urllib.request; urllib.request.urlopen('http://127.0.0.1:${var.api_container_port}/healthz', timeout=3)",
+        ]
+        interval    = 30
+        timeout     = 5
+        retries     = 3
+        startPeriod = 30
+      }
       logConfiguration = {
         logDriver = "awslogs"
         options = {
@@ -382,6 +398,7 @@ resource "aws_ecs_task_definition" "worker" {
       name      = "worker"
       image     = var.worker_image
       essential = true
+      command   = ["celery", "-A", "app.core.celery_app.celery_app", "worker", "--loglevel=INFO", "-Q", "celery"]
       environment = [
         { name = "DATABASE_URL", value = local.database_url },
         { name = "REDIS_URL", value = local.redis_url },
@@ -406,6 +423,37 @@ resource "aws_ecs_task_definition" "worker" {
           readOnly      = false
         }
       ]
+    },
+    # Webhook delivery (I/O-bound) consumes its own "webhook" queue with a thread pool,
+    # so callbacks are not stuck behind long scenario runs in the prefork worker.
+    {
+      name      = "webhook-worker"
+      image     = var.worker_image
+      essential = true
+      command   = ["celery", "-A", "app.core.celery_app.celery_app", "worker", "--loglevel=INFO", "-Q", "webhook", "-P", "threads", "-c", "50"]
+      environment = [
+        { name = "DATABASE_URL", value = local.database_url },
+        { name = "REDIS_URL", value = local.redis_url },
+        { name = "JWT_SECRET_KEY", value = var.jwt_secret_key },
+        { name = "ARTIFACT_ROOT", value = local.artifact_root },
+        # status_url/report_url in the webhook payload
+        { name = "PUBLIC_BASE_URL", value = var.public_base_url != "" ? var.public_base_url : "http://${aws_lb.api.dns_name}" },
+      ]
+      logConfiguration = {
+        logDriver = "awslogs"
+        options = {
+          awslogs-group         = aws_cloudwatch_log_group.worker.name
+          awslogs-region        = var.aws_region
+          awslogs-stream-prefix = "webhook-worker"
+        }
+      }
+      mountPoints = [
+        {
+          sourceVolume  = "data"
+          containerPath = local.data_root
+          readOnly      = false
+        }
+      ]
     }
   ])
 
@@ -435,6 +483,9 @@ resource "aws_ecs_service" "api" {
   desired_count   = var.api_desired_count
   launch_type     = "FARGATE"
 
+  # startup schema retries run for up to ~2 minutes while /readyz is 503; don't kill the task for it
+  health_check_grace_period_seconds = 180
+
   network_configuration {
     subnets         = var.private_subnet_ids
     security_groups = [aws_security_group.ecs.id]
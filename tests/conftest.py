@@ -1,9 +1,10 @@
 """
-Shared pytest configuration for the end-to-end tests.
+Shared pytest configuration.
 
 This configuration introduces a ``--scenario`` command-line option that
 pytest will accept. The ``scenario_path`` fixture exposes the value of
-that option to test functions.
+that option to the end-to-end tests; the ``db`` fixture gives unit tests
+an in-memory SQLite session.
 """
 
 import pytest
@@ -14,6 +15,18 @@ def pytest_addoption(parser):
     parser.addoption("--scenario", action="store", default=None)
 
 
+def pytest_ignore_collect(collection_path, config):
+    """
+    Skip the Playwright scenario runner unless a scenario was given.
+
+    ``tests/e2e`` is executed by the workers with ``--scenario``; a plain
+    ``pytest`` run collects only the unit tests (and does not need Playwright).
+    """
+    if collection_path.name == "e2e" and not config.getoption("--scenario"):
+        return True
+    return None
+
+
 @pytest.fixture(scope="session")
 def scenario_path(pytestconfig):
     """
@@ -27,3 +40,28 @@ def scenario_path(pytestconfig):
     if not path:
         raise RuntimeError("Missing --scenario")
     return path
+
+
+@pytest.fixture
+def db():
+    """
+    Fixture providing a SQLAlchemy session on a fresh in-memory SQLite database.
+
+    All tables are created from the ORM metadata; the database is discarded
+    when the fixture is torn down.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    import app.db.models  # noqa: F401 - registers the tables on Base.metadata
+    from app.db.session import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,58 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import auth
+from app.core.security import pwd_context
+from app.db.models import User
+from app.db.session import get_db
+
+PASSWORD = "correct-horse-42"
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _login(client, password=PASSWORD):
+    return client.post("/auth/token", data={"username": "u1@example.com", "password": password})
+
+
+@pytest.mark.parametrize("scheme", ["bcrypt_sha256", "bcrypt"])
+def test_login_rehashes_legacy_bcrypt_to_argon2id(client, db, scheme):
+    db.add(User(id="u1", email="u1@example.com", password_hash=pwd_context.handler(scheme).hash(PASSWORD)))
+    db.commit()
+
+    res = _login(client)
+    assert res.status_code == 200, res.text
+    db.expire_all()
+    new_hash = db.get(User, "u1").password_hash
+    assert new_hash.startswith("$argon2id$")
+
+    # the upgraded hash keeps working and is not rewritten again
+    assert _login(client).status_code == 200
+    db.expire_all()
+    assert db.get(User, "u1").password_hash == new_hash
+
+
+def test_login_wrong_password_keeps_hash(client, db):
+    legacy = pwd_context.handler("bcrypt_sha256").hash(PASSWORD)
+    db.add(User(id="u1", email="u1@example.com", password_hash=legacy))
+    db.commit()
+    assert _login(client, "wrong-password-1").status_code == 401
+    db.expire_all()
+    assert db.get(User, "u1").password_hash == legacy
+
+
+def test_register_login_me_round_trip(client):
+    res = client.post("/auth/register", json={"email": "u1@example.com", "password": PASSWORD})
+    assert res.status_code == 200, res.text
+    token = _login(client).json()["access_token"]
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.status_code == 200
+    assert me.json()["email"] == "u1@example.com"
+    assert client.get("/auth/me", headers={"Authorization": "Bearer nope"}).status_code == 401
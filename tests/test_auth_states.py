@@ -0,0 +1,63 @@
+import os
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import auth_states
+from app.api.auth import get_current_user
+from app.core import auth_state_store
+
+STATE = {"cookies": [], "origins": [{"origin": "https://example.com", "localStorage": []}]}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_state_store, "_ROOT_PREFIX", str(tmp_path) + os.sep)
+    app = FastAPI()
+    app.include_router(auth_states.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1")
+    return TestClient(app)
+
+
+def _upload(client, content: bytes):
+    return client.post("/auth-states", data={"name": "n"}, files={"storage_state": ("s.json", content)})
+
+
+def _leftovers(tmp_path):
+    return [p.name for p in (tmp_path / "u1").iterdir() if p.name.startswith(".upload-")]
+
+
+def test_upload_streams_large_file_into_store(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_states, "_UPLOAD_CHUNK_SIZE", 16)
+    body = orjson.dumps(STATE | {"cookies": [{"name": "c", "value": "v" * 1000}]})
+    res = _upload(client, body)
+    assert res.status_code == 200, res.text
+    meta = res.json()
+    assert meta["size_bytes"] == len(body)
+    assert (tmp_path / "u1" / f"{meta['id']}.json").read_bytes() == body
+    assert _leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    "content,detail",
+    [
+        (b"", "empty storage_state file"),
+        (b"  \n", "empty storage_state file"),
+        (b"[1, 2]", "storageState must be an object"),
+    ],
+)
+def test_upload_rejected_from_first_chunk(client, tmp_path, content, detail):
+    res = _upload(client, content)
+    assert res.status_code == 400
+    assert res.json()["detail"] == detail
+    assert _leftovers(tmp_path) == []
+
+
+def test_upload_invalid_storage_state(client, tmp_path):
+    res = _upload(client, b'{"cookies": []}')
+    assert res.status_code == 400
+    assert "origins" in res.json()["detail"]
+    assert _leftovers(tmp_path) == []
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "schema_failed", False)
+    monkeypatch.setattr(main, "schema_ready", asyncio.Event())
+    # health checks only; no lifespan (it would start the schema task against the real DB)
+    return TestClient(main.app)
+
+
+def test_schema_failure_fails_probes_without_killing_process(client, monkeypatch):
+    def boom():
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(main, "_create_schema", boom)
+    asyncio.run(main._ensure_schema_bg())
+    assert main.schema_failed is True
+    assert client.get("/readyz").status_code == 503
+    assert client.get("/healthz").status_code == 503
+
+
+def test_probes_while_schema_pending(client):
+    assert client.get("/readyz").status_code == 503
+    assert client.get("/healthz").json() == {"alive": True}
+
+
+def test_startup_warns_when_api_key_pepper_is_derived(monkeypatch, caplog):
+    async def noop():
+        pass
+
+    monkeypatch.setattr(main, "API_KEY_PEPPER_DERIVED", True)
+    monkeypatch.setattr(main, "_ensure_schema_bg", noop)
+    with caplog.at_level("WARNING", logger="app.main"), TestClient(main.app):
+        pass
+    assert any("API_KEY_PEPPER is not set" in r.message for r in caplog.records)
@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.api import public
+from app.api.public import get_team_api_key, invalidate_team_api_key_cache
+from app.core.security import hash_api_key_secret
+from app.db.models import Team, TeamApiKey, User
+
+PREFIX = "0123456789abcdef"
+SECRET = "s3cret-token"
+TOKEN = f"dubbi_sk_{PREFIX}_{SECRET}"
+
+
+@pytest.fixture(autouse=True)
+def _clear_key_cache():
+    public._KEY_CACHE.clear()
+    yield
+    public._KEY_CACHE.clear()
+
+
+@pytest.fixture
+def api_key(db):
+    db.add(User(id="u1", email="u1@example.com", password_hash="x"))
+    db.add(Team(id="t1", name="team"))
+    key = TeamApiKey(
+        id="k1", team_id="t1", name="ci", prefix=PREFIX, secret_hash=hash_api_key_secret(SECRET), created_by_user_id="u1"
+    )
+    db.add(key)
+    db.commit()
+    return key
+
+
+def _record_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    return statements
+
+
+def test_valid_key(db, api_key):
+    principal = get_team_api_key(TOKEN, db)
+    assert (principal.id, principal.team_id, principal.created_by_user_id) == ("k1", "t1", "u1")
+
+
+@pytest.mark.parametrize("token", [None, "garbage", f"dubbi_sk_{PREFIX}_wrong", "dubbi_sk_ffffffffffffffff_x"])
+def test_invalid_key(db, api_key, token):
+    with pytest.raises(HTTPException) as exc:
+        get_team_api_key(token, db)
+    assert exc.value.status_code == 401
+
+
+def test_cache_hit_skips_db(db, api_key):
+    get_team_api_key(TOKEN, db)
+    statements = _record_statements(db)
+    assert get_team_api_key(TOKEN, db).id == "k1"
+    assert statements == []
+
+
+def test_cache_hit_still_rejects_wrong_secret(db, api_key):
+    get_team_api_key(TOKEN, db)
+    with pytest.raises(HTTPException):
+        get_team_api_key(f"dubbi_sk_{PREFIX}_wrong", db)
+
+
+def test_revoked_key_rejected_after_invalidation(db, api_key):
+    get_team_api_key(TOKEN, db)
+    api_key.revoked_at = datetime.now(timezone.utc)
+    db.commit()
+    invalidate_team_api_key_cache(PREFIX)
+    with pytest.raises(HTTPException) as exc:
+        get_team_api_key(TOKEN, db)
+    assert exc.value.status_code == 401
+
+
+def test_legacy_hash_upgraded_on_first_use(db, api_key):
+    api_key.secret_hash = hashlib.sha256(SECRET.encode("utf-8")).hexdigest()
+    db.commit()
+    assert get_team_api_key(TOKEN, db).id == "k1"
+    db.expire_all()
+    assert db.get(TeamApiKey, "k1").secret_hash == hash_api_key_secret(SECRET)
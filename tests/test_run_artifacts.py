@@ -0,0 +1,66 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_runs
+from app.api.auth import get_current_user
+from app.db.models import Run, User
+from app.db.session import get_db
+
+
+@pytest.fixture
+def run_dir(db, tmp_path):
+    d = tmp_path / "run"
+    d.mkdir()
+    db.add(User(id="u1", email="u1@example.com", password_hash="x"))
+    db.add(Run(id="r1", status="PASSED", scenario_path="s.json", artifact_dir=str(d), owner_user_id="u1"))
+    db.commit()
+    return d
+
+
+@pytest.fixture
+def client(db, run_dir):
+    app = FastAPI()
+    app.include_router(routes_runs.router, prefix="/runs")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1")
+    return TestClient(app)
+
+
+def test_list_artifacts_sorted_by_mtime(client, run_dir):
+    for i, name in enumerate(["b.png", "a.log", "c.webm"]):
+        (run_dir / name).write_bytes(b"x" * (i + 1))
+        os.utime(run_dir / name, (1000 + i, 1000 + i))
+    (run_dir / "sub").mkdir()
+    res = client.get("/runs/r1/artifacts")
+    assert res.status_code == 200
+    assert res.json() == [
+        {"name": "b.png", "size": 1, "mtime_epoch": 1000},
+        {"name": "a.log", "size": 2, "mtime_epoch": 1001},
+        {"name": "c.webm", "size": 3, "mtime_epoch": 1002},
+    ]
+
+
+def test_download_artifact(client, run_dir):
+    (run_dir / "trace.zip").write_bytes(b"zip")
+    res = client.get("/runs/r1/artifacts/trace.zip")
+    assert res.status_code == 200
+    assert res.content == b"zip"
+    assert client.get("/runs/r1/artifacts/missing.zip").status_code == 404
+
+
+def test_download_symlinked_artifact_inside_run_dir(client, run_dir):
+    (run_dir / "video-1.webm").write_bytes(b"webm")
+    (run_dir / "video.webm").symlink_to(run_dir / "video-1.webm")
+    res = client.get("/runs/r1/artifacts/video.webm")
+    assert res.status_code == 200
+    assert res.content == b"webm"
+
+
+def test_download_symlink_escaping_run_dir(client, run_dir, tmp_path):
+    (tmp_path / "secret").write_bytes(b"secret")
+    (run_dir / "leak").symlink_to(tmp_path / "secret")
+    assert client.get("/runs/r1/artifacts/leak").status_code == 400
@@ -0,0 +1,63 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+
+from app.db import schema_ensure
+from app.db.schema_ensure import _SQL, _apply_best_effort, _schema_version
+
+PG = SimpleNamespace(dialect=postgresql.dialect())
+
+
+def _metadata(*cols):
+    md = MetaData()
+    Table("t", md, Column("id", Integer, primary_key=True), *cols)
+    return md
+
+
+def test_schema_version_is_stable_and_tracks_ddl():
+    v = _schema_version(PG, _metadata(), _SQL)
+    assert v == _schema_version(PG, _metadata(), _SQL)
+    assert v != _schema_version(PG, _metadata(Column("extra", Integer)), _SQL)
+    assert v != _schema_version(PG, _metadata(), _SQL + ("ALTER TABLE t ADD COLUMN IF NOT EXISTS x INTEGER",))
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class _Conn:
+    def __init__(self, exc=None):
+        self.exc = exc
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, stmt):
+        if self.exc is not None:
+            raise self.exc
+
+
+def test_apply_best_effort_reraises_lock_timeout():
+    exc = DBAPIError("ALTER TABLE", None, _PgError(schema_ensure._PG_LOCK_NOT_AVAILABLE))
+    with pytest.raises(DBAPIError):
+        _apply_best_effort(_Conn(exc), text("ALTER TABLE t"))
+
+
+def test_apply_best_effort_swallows_other_errors():
+    exc = DBAPIError("ALTER TABLE", None, _PgError("42701"))
+    assert _apply_best_effort(_Conn(exc), text("ALTER TABLE t")) is False
+    assert _apply_best_effort(_Conn(), text("ALTER TABLE t")) is True
+
+
+def test_ensure_schema_on_sqlite_creates_tables():
+    from sqlalchemy import create_engine, inspect
+
+    engine = create_engine("sqlite://")
+    schema_ensure.ensure_schema(engine, _metadata())
+    assert inspect(engine).has_table("t")
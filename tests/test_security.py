@@ -0,0 +1,22 @@
+import hashlib
+
+from app.core.security import hash_api_key_secret, verify_and_update_api_key_secret
+
+SECRET = "s3cret-token"
+
+
+def test_api_key_hash_is_keyed():
+    unkeyed = hashlib.blake2b(SECRET.encode("utf-8"), digest_size=32).hexdigest()
+    assert hash_api_key_secret(SECRET) not in ("b2$" + unkeyed, "b2$" + hashlib.sha256(SECRET.encode("utf-8")).hexdigest())
+
+
+def test_api_key_current_hash_verifies_without_upgrade():
+    assert verify_and_update_api_key_secret(SECRET, hash_api_key_secret(SECRET)) == (True, None)
+    assert verify_and_update_api_key_secret("wrong", hash_api_key_secret(SECRET)) == (False, None)
+
+
+def test_api_key_legacy_sha256_is_upgraded():
+    legacy = hashlib.sha256(SECRET.encode("utf-8")).hexdigest()
+    assert verify_and_update_api_key_secret(SECRET, legacy) == (True, hash_api_key_secret(SECRET))
+    assert verify_and_update_api_key_secret("wrong", legacy) == (False, None)
+
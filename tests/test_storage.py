@@ -0,0 +1,96 @@
+import errno
+import os
+import shutil
+
+import pytest
+
+from app.core.storage import ensure_dir, link_or_copy, write_case_dirs, write_file_atomic, write_file_bytes
+
+
+def test_ensure_dir_recreates_removed_directory(tmp_path):
+    d = str(tmp_path / "a" / "b")
+    assert ensure_dir(d) == d
+    shutil.rmtree(tmp_path / "a")
+    ensure_dir(d)
+    write_file_bytes(os.path.join(d, "f"), b"x")
+    assert (tmp_path / "a" / "b" / "f").read_bytes() == b"x"
+
+
+def test_write_case_dirs(tmp_path):
+    src = tmp_path / "state.json"
+    src.write_bytes(b"{}")
+    cases = [(str(tmp_path / f"case_{i}"), str(tmp_path / f"case_{i}" / "combined.json"), b"%d" % i) for i in range(3)]
+    write_case_dirs(cases, storage_state_src=str(src), storage_state_name="storage_state.json")
+    for i in range(3):
+        assert (tmp_path / f"case_{i}" / "combined.json").read_bytes() == b"%d" % i
+        assert (tmp_path / f"case_{i}" / "storage_state.json").read_bytes() == b"{}"
+
+
+def test_write_case_dirs_raises_when_storage_state_missing(tmp_path):
+    cases = [(str(tmp_path / "case"), str(tmp_path / "case" / "combined.json"), b"{}")]
+    with pytest.raises(FileNotFoundError):
+        write_case_dirs(cases, storage_state_src=str(tmp_path / "missing.json"))
+
+
+def test_write_file_atomic_replaces_without_leftovers(tmp_path):
+    target = tmp_path / "scenario.json"
+    target.write_bytes(b"old")
+    write_file_atomic(str(target), b"new")
+    assert target.read_bytes() == b"new"
+    assert oct(target.stat().st_mode & 0o777) == oct(0o644)
+    assert [p.name for p in tmp_path.iterdir()] == ["scenario.json"]
+
+
+def test_write_file_atomic_failure_keeps_old_file(tmp_path, monkeypatch):
+    target = tmp_path / "scenario.json"
+    target.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_file_atomic(str(target), b"new")
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["scenario.json"]
+
+
+def test_link_or_copy_twice_keeps_source(tmp_path):
+    src, dst = tmp_path / "state.json", tmp_path / "storage_state.json"
+    src.write_bytes(b'{"cookies": []}')
+    link_or_copy(str(src), str(dst))
+    link_or_copy(str(src), str(dst))
+    assert src.read_bytes() == b'{"cookies": []}'
+    assert dst.read_bytes() == b'{"cookies": []}'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json", "storage_state.json"]
+
+
+def test_link_or_copy_replaces_other_existing_file(tmp_path):
+    src, dst = tmp_path / "state.json", tmp_path / "storage_state.json"
+    src.write_bytes(b"new")
+    dst.write_bytes(b"old")
+    link_or_copy(str(src), str(dst))
+    assert dst.read_bytes() == b"new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json", "storage_state.json"]
+
+
+def test_link_or_copy_copies_across_devices(tmp_path, monkeypatch):
+    src, dst = tmp_path / "state.json", tmp_path / "storage_state.json"
+    src.write_bytes(b"data")
+    dst.write_bytes(b"old")
+
+    def no_link(a, b):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(os, "link", no_link)
+    link_or_copy(str(src), str(dst))
+    link_or_copy(str(src), str(dst))
+    assert src.read_bytes() == b"data"
+    assert dst.read_bytes() == b"data"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json", "storage_state.json"]
+
+
+def test_link_or_copy_missing_source_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        link_or_copy(str(tmp_path / "missing.json"), str(tmp_path / "dst.json"))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from app.db.crud import bulk_mark_suite_cases
+from app.db.models import SuiteCase, SuiteRun, SuiteStatus, User
+
+
+def test_bulk_mark_suite_cases(db):
+    db.add(User(id="u1", email="u1@example.com", password_hash="x"))
+    db.add(SuiteRun(id="s1", requested_by_user_id="u1", artifact_dir="/tmp/s1"))
+    for i in range(3):
+        db.add(
+            SuiteCase(
+                id=f"c{i}",
+                suite_run_id="s1",
+                case_index=i + 1,
+                status=SuiteStatus.RUNNING.value,
+                artifact_dir=f"/tmp/s1/{i}",
+                combined_scenario_path=f"/tmp/s1/{i}/combined.json",
+            )
+        )
+    db.commit()
+    done = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    bulk_mark_suite_cases(db, [("c0", SuiteStatus.PASSED.value, done, 0), ("c1", SuiteStatus.FAILED.value, done, 1)])
+
+    by_id = {c.id: c for c in db.query(SuiteCase).all()}
+    assert (by_id["c0"].status, by_id["c0"].exit_code) == (SuiteStatus.PASSED.value, 0)
+    assert (by_id["c1"].status, by_id["c1"].exit_code) == (SuiteStatus.FAILED.value, 1)
+    assert by_id["c1"].finished_at is not None
+    assert (by_id["c2"].status, by_id["c2"].finished_at) == (SuiteStatus.RUNNING.value, None)
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlencode
+
+import pytest
+
+from app.db.crud import decode_history_cursor, encode_history_cursor, suite_run_history_page
+from app.db.models import SuiteRun, User
+
+
+def _seed(db, n):
+    db.add(User(id="u1", email="u1@example.com", password_hash="x"))
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # pairs share a created_at so page boundaries fall inside ties
+    for i in range(n):
+        db.add(
+            SuiteRun(
+                id=f"run-{i:03d}",
+                requested_by_user_id="u1",
+                created_at=base + timedelta(seconds=i // 2),
+                artifact_dir=f"/tmp/{i}",
+            )
+        )
+    db.commit()
+
+
+def test_cursor_survives_unencoded_query_string():
+    cursor = encode_history_cursor(datetime(2025, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc), "abc")
+    # clients may paste the header value into the URL without encoding it
+    assert parse_qs(f"cursor={cursor}")["cursor"] == [cursor]
+    assert parse_qs(urlencode({"cursor": cursor}))["cursor"] == [cursor]
+    assert decode_history_cursor(cursor) == (datetime(2025, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc), "abc")
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "Zm9v", "YWJjOg"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_history_cursor(cursor)
+
+
+def test_history_pages_cover_every_row_once(db):
+    _seed(db, 7)
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = suite_run_history_page(db, requested_by_user_id="u1", cursor=cursor, limit=3)
+        seen.extend(r.id for r in rows)
+        if cursor is None:
+            break
+    assert seen == [f"run-{i:03d}" for i in reversed(range(7))]
+
+
+def test_history_default_limit_keeps_full_history(db):
+    _seed(db, 7)
+    rows, cursor = suite_run_history_page(db, requested_by_user_id="u1")
+    assert len(rows) == 7
+    assert cursor is None